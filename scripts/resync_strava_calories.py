@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Re-sync Strava activities to capture calories from detailed API."""
 
-import sqlite3
+import asyncio
 from pathlib import Path
 from datetime import datetime, timedelta
 import sys
@@ -26,50 +26,60 @@ if not client.is_configured:
     print("Strava not configured. Check your .env file.")
     exit(1)
 
-# Fetch last 30 days of activities with details
-activities = client.get_recent_activities(days=30, fetch_details=True)
-print(f"\nFound {len(activities)} activities from Strava")
 
-# Show what we got
-print("\nActivity summary:")
-for a in activities:
-    cal_str = f"{a.calories_burned:.0f} cal" if a.calories_burned else "no calories"
-    print(f"  {a.start_time.date() if a.start_time else '?'}: {a.name[:40]} - {cal_str}")
+async def fetch_recent(days: int):
+    async with client:
+        return await client.get_recent_activities_async(days=days)
+
+
+# Fetch last 30 days of activities, pulling details concurrently
+activities = asyncio.run(fetch_recent(30))
+print(f"\nFound {len(activities)} activities from Strava")
 
 if not activities:
     print("No activities found.")
     exit(0)
 
+# Show what we got
+print("\nActivity summary:")
+print("\n".join(
+    f"  {a.start_time.date() if a.start_time else '?'}: {a.name[:40]} - "
+    + (f"{a.calories_burned:.0f} cal" if a.calories_burned else "no calories")
+    for a in activities
+))
+
 # Update database
 print("\nUpdating database...")
-with AnalyticsDB() as db:
-    updated = 0
-    for activity in activities:
-        if activity.calories_burned and activity.activity_id:
-            # Update existing activity with calories
-            result = db.conn.execute("""
-                UPDATE activities 
-                SET calories_burned = ?
-                WHERE external_id = ? AND source = 'strava'
-            """, [activity.calories_burned, activity.activity_id])
-            if result.rowcount > 0:
-                updated += 1
+with AnalyticsDB(db_path) as db:
+    # Update existing activities with calories in one transaction
+    rows = [
+        (activity.calories_burned, activity.activity_id)
+        for activity in activities
+        if activity.calories_burned and activity.activity_id
+    ]
+    # The connection is already in WAL mode; NORMAL skips the per-commit fsync
+    db.conn.execute("PRAGMA synchronous = NORMAL")
+    with db.conn:
+        result = db.conn.executemany("""
+            UPDATE activities 
+            SET calories_burned = ?
+            WHERE external_id = ? AND source = 'strava'
+        """, rows)
+    updated = result.rowcount if rows else 0
     
-    db.conn.commit()
     print(f"\nUpdated {updated} activities with calorie data.")
 
-# Show current state
-print("\nCurrent activities with calories in database:")
-conn = sqlite3.connect(db_path)
-cursor = conn.execute("""
-    SELECT entry_date, name, duration_minutes, calories_burned, source
-    FROM activities
-    WHERE calories_burned IS NOT NULL AND calories_burned > 0
-    ORDER BY entry_date DESC
-    LIMIT 15
-""")
-for row in cursor:
-    print(f"  {row[0]}: {row[1][:40]} - {row[2]:.0f}min - {row[3]:.0f} cal ({row[4]})")
-
-conn.close()
+    # Show current state
+    print("\nCurrent activities with calories in database:")
+    rows = db.conn.execute("""
+        SELECT entry_date, name, duration_minutes, calories_burned, source
+        FROM activities
+        WHERE calories_burned IS NOT NULL AND calories_burned > 0
+        ORDER BY entry_date DESC
+        LIMIT 15
+    """).fetchall()
+    print("\n".join(
+        f"  {r[0]}: {r[1][:40]} - {r[2]:.0f}min - {r[3]:.0f} cal ({r[4]})" for r in rows
+    ))
+
 print("\nDone!")
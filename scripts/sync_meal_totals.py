@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
-"""One-time script to sync meal totals from meals table to daily_summary."""
+"""One-time script to sync meal totals from meals table to daily_summary.
+
+AnalyticsDB now keeps these totals current with triggers on the meals table,
+and rebuilds them once when it first installs the triggers. This script is
+only needed to repair totals by hand without opening AnalyticsDB.
+"""
 
 import sqlite3
+from collections import Counter
 from pathlib import Path
 
 # Find the database
@@ -12,63 +18,117 @@ if not db_path.exists():
     exit(1)
 
 print(f"Connecting to {db_path}")
-conn = sqlite3.connect(db_path)
+# Autocommit mode so we control the transaction explicitly below
+conn = sqlite3.connect(db_path, isolation_level=None)
+conn.execute("PRAGMA journal_mode = WAL")
+conn.execute("PRAGMA synchronous = NORMAL")
+conn.execute("PRAGMA temp_store = MEMORY")
+conn.execute("PRAGMA mmap_size = 268435456")
 
-# Check for duplicates first
-print("\nChecking for duplicate entries...")
-cursor = conn.execute("""
-    SELECT entry_date, COUNT(*) as cnt 
-    FROM daily_summary 
-    GROUP BY entry_date 
-    HAVING cnt > 1
-    ORDER BY cnt DESC
-    LIMIT 10
-""")
-duplicates = cursor.fetchall()
+# Dedup + totals run as one write transaction: one lock, one WAL flush
+conn.execute("BEGIN IMMEDIATE")
 
-if duplicates:
-    print(f"Found {len(duplicates)} dates with duplicates!")
-    for row in duplicates:
-        print(f"  {row[0]}: {row[1]} copies")
-    
-    print("\nRemoving duplicates (keeping one per date)...")
-    # Delete duplicates by keeping only the row with the earliest rowid
-    conn.execute("""
-        DELETE FROM daily_summary 
-        WHERE rowid NOT IN (
-            SELECT MIN(rowid) 
-            FROM daily_summary 
-            GROUP BY entry_date
+# AnalyticsDB adds a unique index on entry_date, after which upserts make
+# duplicates impossible and there is nothing to clean up
+has_unique_date = any(
+    index[2]
+    and [col[2] for col in conn.execute(f"PRAGMA index_info({index[1]!r})")] == ["entry_date"]
+    for index in conn.execute("PRAGMA index_list(daily_summary)").fetchall()
+)
+
+if has_unique_date:
+    print("\nentry_date is unique - no duplicates possible.")
+else:
+    # Remove duplicates in one pass; RETURNING reports what was deleted
+    print("\nRemoving duplicate entries (keeping the newest per date)...")
+    # Keep only the most recently written row per date (single scan)
+    removed = conn.execute("""
+        WITH d AS (
+            SELECT rowid AS rid,
+                   ROW_NUMBER() OVER (PARTITION BY entry_date ORDER BY rowid DESC) AS rn
+            FROM daily_summary
         )
-    """)
-    conn.commit()
-    print("Duplicates removed.")
+        DELETE FROM daily_summary
+        WHERE rowid IN (SELECT rid FROM d WHERE rn > 1)
+        RETURNING entry_date
+    """).fetchall()
+    
+    if removed:
+        extra_copies = Counter(row[0] for row in removed)
+        print(f"Found {len(extra_copies)} dates with duplicates!")
+        print("\n".join(
+            f"  {entry_date}: {extra + 1} copies"
+            for entry_date, extra in extra_copies.most_common(10)
+        ))
+        print(f"Duplicates removed ({len(removed)} rows).")
+    else:
+        print("No duplicates found.")
+    
+    # One-time migration: from now on duplicates are rejected at insert time
+    conn.execute(
+        "CREATE UNIQUE INDEX uq_daily_summary_entry_date ON daily_summary(entry_date)"
+    )
 
 # Now run the update
 print("\nSyncing meal totals to daily_summary...")
+# Covering index lets the aggregate below read only the index B-tree
+conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_meals_entry_date_cov
+    ON meals(entry_date, calories, protein_g, carbs_g, fat_g, fiber_g)
+""")
+conn.execute("ANALYZE meals")
+
+# Aggregate meals once per date and join the totals in (UPDATE ... FROM, SQLite 3.33+)
+conn.execute("""
+    WITH m AS (
+        SELECT
+            entry_date,
+            COUNT(*) AS cnt,
+            COALESCE(SUM(calories), 0) AS cal,
+            COALESCE(SUM(protein_g), 0) AS p,
+            COALESCE(SUM(carbs_g), 0) AS c,
+            COALESCE(SUM(fat_g), 0) AS f,
+            COALESCE(SUM(fiber_g), 0) AS fi
+        FROM meals
+        GROUP BY entry_date
+    )
+    UPDATE daily_summary
+    SET 
+        meal_count = m.cnt,
+        total_calories = m.cal,
+        total_protein_g = m.p,
+        total_carbs_g = m.c,
+        total_fat_g = m.f,
+        total_fiber_g = m.fi,
+        updated_at = datetime('now')
+    FROM m
+    WHERE daily_summary.entry_date = m.entry_date
+""")
+# Days with no meals aren't matched by the join above - zero them out
 conn.execute("""
     UPDATE daily_summary
     SET 
-        meal_count = (SELECT COUNT(*) FROM meals WHERE meals.entry_date = daily_summary.entry_date),
-        total_calories = (SELECT COALESCE(SUM(calories), 0) FROM meals WHERE meals.entry_date = daily_summary.entry_date),
-        total_protein_g = (SELECT COALESCE(SUM(protein_g), 0) FROM meals WHERE meals.entry_date = daily_summary.entry_date),
-        total_carbs_g = (SELECT COALESCE(SUM(carbs_g), 0) FROM meals WHERE meals.entry_date = daily_summary.entry_date),
-        total_fat_g = (SELECT COALESCE(SUM(fat_g), 0) FROM meals WHERE meals.entry_date = daily_summary.entry_date),
-        total_fiber_g = (SELECT COALESCE(SUM(fiber_g), 0) FROM meals WHERE meals.entry_date = daily_summary.entry_date),
+        meal_count = 0,
+        total_calories = 0,
+        total_protein_g = 0,
+        total_carbs_g = 0,
+        total_fat_g = 0,
+        total_fiber_g = 0,
         updated_at = datetime('now')
+    WHERE (COALESCE(meal_count, 0) != 0 OR COALESCE(total_calories, 0) != 0)
+      AND NOT EXISTS (SELECT 1 FROM meals WHERE meals.entry_date = daily_summary.entry_date)
 """)
-conn.commit()
+conn.execute("COMMIT")
 
 # Show results
 print("\nUpdated! Here are the last 10 days:")
-cursor = conn.execute("""
+rows = conn.execute("""
     SELECT entry_date, meal_count, total_calories 
     FROM daily_summary 
     ORDER BY entry_date DESC 
     LIMIT 10
-""")
-for row in cursor:
-    print(f"  {row[0]}: {row[1]} meals, {row[2]:.0f} calories")
+""").fetchall()
+print("\n".join(f"  {r[0]}: {r[1]} meals, {r[2]:.0f} calories" for r in rows))
 
 conn.close()
 print("\nDone!")
@@ -1,16 +1,16 @@
 """Command-line interface for Daily Diary."""
 
-from datetime import date, datetime, timedelta
+import re
+from datetime import date, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import typer
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
-
-from .models.entry import DiaryEntry
-from .services import DiaryPrompter, DiaryStorage, TranscriptionService
+from rich.text import Text
 
 app = typer.Typer(
     name="diary",
@@ -19,6 +19,61 @@ app = typer.Typer(
 )
 console = Console()
 
+# "-N" means N days ago; keywords map to a fixed number of days ago
+_RELATIVE_DAYS_RE = re.compile(r"-(\d+)")
+_DATE_KEYWORDS = {"today": 0, "yesterday": 1}
+
+# Column specs (header, style, justify) for the multi-column report tables
+_LIST_COLUMNS = (
+    ("Date", "cyan", "left"),
+    ("Wellbeing", None, "center"),
+    ("Symptoms", None, "center"),
+    ("Activity", None, "right"),
+    ("Sleep", None, "center"),
+    ("Weather", None, "right"),
+    ("✓", None, "center"),
+)
+_NUTRITION_COLUMNS = (
+    ("Date", "cyan", "left"),
+    ("Meals", None, "right"),
+    ("Calories", None, "right"),
+    ("Protein", None, "right"),
+    ("Carbs", None, "right"),
+    ("Fat", None, "right"),
+)
+_SLEEP_COLUMNS = (
+    ("Date", "cyan", "left"),
+    ("Score", None, "right"),
+    ("Duration", None, "right"),
+    ("Deep", None, "right"),
+    ("REM", None, "right"),
+    ("HRV", None, "right"),
+    ("Efficiency", None, "right"),
+)
+
+
+def _make_table(title: str, columns: tuple) -> Table:
+    """Create a table with the given (header, style, justify) columns."""
+    table = Table(title=title)
+    for header, style, justify in columns:
+        table.add_column(header, style=style, justify=justify)
+    return table
+
+
+@lru_cache(maxsize=128)
+def _parse_iso_date(date_str: str) -> date:
+    """Parse a YYYY-MM-DD string (cached; the result doesn't depend on today)."""
+    # fromisoformat is implemented in C; strptime interprets the format in Python
+    return date.fromisoformat(date_str.strip())
+
+
+def _file_size(path: Path) -> int:
+    """Size of a file in bytes, or 0 if it doesn't exist (one stat call)."""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
 
 def parse_date(date_str: Optional[str]) -> date:
     """Parse a date string or return today.
@@ -30,19 +85,22 @@ def parse_date(date_str: Optional[str]) -> date:
     - "-N": N days ago (e.g., "-1" = yesterday, "-7" = a week ago)
     - "YYYY-MM-DD": specific date
     """
-    if date_str is None or date_str.lower() == "today":
+    if date_str is None:
         return date.today()
     
-    if date_str.lower() == "yesterday":
-        return date.today() - timedelta(days=1)
+    days_ago = _DATE_KEYWORDS.get(date_str)
+    if days_ago is None:
+        days_ago = _DATE_KEYWORDS.get(date_str.lower())
+    if days_ago is not None:
+        return date.today() - timedelta(days=days_ago)
     
     # Relative days: -1, -2, -7, etc.
-    if date_str.startswith("-") and date_str[1:].isdigit():
-        days_ago = int(date_str[1:])
-        return date.today() - timedelta(days=days_ago)
+    match = _RELATIVE_DAYS_RE.fullmatch(date_str)
+    if match:
+        return date.today() - timedelta(days=int(match.group(1)))
     
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d").date()
+        return _parse_iso_date(date_str)
     except ValueError:
         console.print(f"[red]Invalid date format: {date_str}[/red]")
         console.print("[dim]Use: YYYY-MM-DD, 'yesterday', or -N (days ago)[/dim]")
@@ -57,6 +115,8 @@ def new(
     ),
 ):
     """Start a new diary entry or continue an existing one."""
+    from .services.prompting import DiaryPrompter
+    
     entry_date = parse_date(date_str)
     
     prompter = DiaryPrompter()
@@ -71,6 +131,8 @@ def symptom(
     ),
 ):
     """Quick symptom logging."""
+    from .services.prompting import DiaryPrompter
+    
     entry_date = parse_date(date_str)
     
     prompter = DiaryPrompter()
@@ -85,6 +147,8 @@ def show(
     ),
 ):
     """Show a diary entry."""
+    from .services.storage import DiaryStorage
+    
     entry_date = parse_date(date_str)
     
     with DiaryStorage() as storage:
@@ -94,29 +158,31 @@ def show(
             console.print(f"[yellow]No entry found for {entry_date}[/yellow]")
             raise typer.Exit(0)
         
-        # Display entry
-        console.print(Panel(
+        # Collect everything and render it in one print
+        parts = [Panel(
             entry.summary(),
             title=f"📔 {entry_date.strftime('%A, %B %d, %Y')}",
-        ))
+        )]
         
         # Symptoms
         if entry.symptoms:
-            console.print("\n[bold]Symptoms:[/bold]")
+            parts.append("\n[bold]Symptoms:[/bold]")
             for s in entry.symptoms:
-                console.print(f"  • {s.display_type}: severity {s.severity.value}/10")
+                parts.append(f"  • {s.display_type}: severity {s.severity.value}/10")
                 if s.notes:
-                    console.print(f"    [dim]{s.notes}[/dim]")
+                    parts.append(f"    [dim]{s.notes}[/dim]")
         
         # Incidents
         if entry.incidents:
-            console.print("\n[bold]Incidents:[/bold]")
+            parts.append("\n[bold]Incidents:[/bold]")
             for i in entry.incidents:
-                console.print(f"  • {i.display_type} ({i.location.value}): {i.description}")
+                parts.append(f"  • {i.display_type} ({i.location.value}): {i.description}")
         
         # Notes
         if entry.general_notes:
-            console.print(f"\n[bold]Notes:[/bold] {entry.general_notes}")
+            parts.append(f"\n[bold]Notes:[/bold] {entry.general_notes}")
+        
+        console.print(Group(*parts))
 
 
 @app.command(name="list")
@@ -127,66 +193,77 @@ def list_entries(
     ),
 ):
     """List recent diary entries."""
+    from itertools import chain
+    
+    from rich.live import Live
+    
+    from .services.storage import DiaryStorage
+    
     with DiaryStorage() as storage:
-        entries = storage.get_recent_entries(days)
+        # Raw stored documents: the table only needs a few scalars per day,
+        # so skip building full DiaryEntry models
+        entries = storage.iter_recent_documents(days)
         
-        if not entries:
+        first = next(entries, None)
+        if first is None:
             console.print("[yellow]No entries found[/yellow]")
             raise typer.Exit(0)
         
-        table = Table(title=f"Recent Entries (last {days} days)")
-        table.add_column("Date", style="cyan")
-        table.add_column("Wellbeing", justify="center")
-        table.add_column("Symptoms", justify="center")
-        table.add_column("Activity", justify="right")
-        table.add_column("Sleep", justify="center")
-        table.add_column("Weather", justify="right")
-        table.add_column("✓", justify="center")
-        
-        for entry in entries:
-            # Activity
-            activity_mins = entry.integrations.total_activity_minutes
-            elevation = entry.integrations.total_elevation_gain
-            activity_str = "-"
-            if activity_mins:
-                activity_str = f"{activity_mins:.0f}m"
-                if elevation:
-                    activity_str += f" ({elevation:.0f}m↑)"
-            
-            # Sleep
-            sleep_str = "-"
-            if entry.integrations.sleep and entry.integrations.sleep.sleep_score:
-                sleep_str = str(entry.integrations.sleep.sleep_score)
-            
-            # Weather
-            weather_str = "-"
-            if entry.integrations.weather:
-                w = entry.integrations.weather
-                parts = []
-                if w.temp_avg_c:
-                    parts.append(f"{w.temp_avg_c:.0f}°C")
-                if w.pressure_hpa:
-                    parts.append(f"{w.pressure_hpa:.0f}hPa")
-                weather_str = " ".join(parts) if parts else "-"
-            
-            # Symptoms with severity coloring
-            symptom_str = "[green]✓[/green]"
-            if entry.symptoms:
-                worst = entry.worst_symptom_severity
-                color = "green" if worst <= 2 else "yellow" if worst <= 5 else "red"
-                symptom_str = f"[{color}]{len(entry.symptoms)} ({worst}/10)[/{color}]"
-            
-            table.add_row(
-                entry.entry_date.strftime("%Y-%m-%d"),
-                f"{entry.overall_wellbeing or '-'}/10",
-                symptom_str,
-                activity_str,
-                sleep_str,
-                weather_str,
-                "✓" if entry.is_complete else "",
-            )
+        table = _make_table(f"Recent Entries (last {days} days)", _LIST_COLUMNS)
         
-        console.print(table)
+        # Render rows as each entry is read rather than after all of them
+        with Live(table, console=console, refresh_per_second=8):
+            for entry in chain([first], entries):
+                integrations = entry.get("integrations") or {}
+                activities = integrations.get("activities") or []
+                sleep = integrations.get("sleep") or {}
+                w = integrations.get("weather") or {}
+                symptoms = entry.get("symptoms") or []
+                
+                # Activity
+                activity_str = "-"
+                activity_mins = sum(a["duration_minutes"] for a in activities)
+                if activity_mins:
+                    activity_str = f"{activity_mins:.0f}m"
+                    elevation = sum(a.get("elevation_gain_m") or 0 for a in activities)
+                    if elevation:
+                        activity_str += f" ({elevation:.0f}m↑)"
+                
+                # Sleep
+                sleep_str = "-"
+                if sleep.get("sleep_score"):
+                    sleep_str = str(sleep["sleep_score"])
+                
+                # Weather
+                weather_str = "-"
+                if w:
+                    parts = []
+                    if w.get("temp_avg_c"):
+                        parts.append(f"{w['temp_avg_c']:.0f}°C")
+                    if w.get("pressure_hpa"):
+                        parts.append(f"{w['pressure_hpa']:.0f}hPa")
+                    weather_str = " ".join(parts) if parts else "-"
+                
+                # Symptoms with severity coloring (pre-styled, no markup to parse)
+                symptom_cell = Text("✓", style="green")
+                if symptoms:
+                    worst = max(s["severity"] for s in symptoms)
+                    color = "green" if worst <= 2 else "yellow" if worst <= 5 else "red"
+                    symptom_cell = Text(f"{len(symptoms)} ({worst}/10)", style=color)
+                
+                table.add_row(
+                    entry["entry_date"],
+                    f"{entry.get('overall_wellbeing') or '-'}/10",
+                    symptom_cell,
+                    activity_str,
+                    sleep_str,
+                    weather_str,
+                    "✓" if entry.get("is_complete") else "",
+                )
+        
+        # Live leaves output on the table's last line when stdout isn't a terminal
+        if not console.is_terminal:
+            console.line()
 
 
 @app.command()
@@ -194,6 +271,8 @@ def search(
     query: str = typer.Argument(..., help="Search term"),
 ):
     """Search diary entries."""
+    from .services.storage import DiaryStorage
+    
     with DiaryStorage() as storage:
         entries = storage.search_entries(query)
         
@@ -203,11 +282,13 @@ def search(
         
         console.print(f"Found {len(entries)} entries matching '{query}':\n")
         
-        for entry in entries[:10]:  # Limit to 10 results
-            console.print(Panel(
+        console.print(Group(*(
+            Panel(
                 entry.summary(),
                 title=entry.entry_date.strftime("%Y-%m-%d"),
-            ))
+            )
+            for entry in entries[:10]  # Limit to 10 results
+        )))
 
 
 @app.command()
@@ -223,6 +304,9 @@ def transcribe(
     ),
 ):
     """Transcribe an audio file and add to notes."""
+    from .services.storage import DiaryStorage
+    from .services.transcription import TranscriptionService
+    
     entry_date = parse_date(date_str)
     
     transcription_service = TranscriptionService()
@@ -233,13 +317,27 @@ def transcribe(
     
     console.print(f"Transcribing {audio_file.name}...")
     
-    text = transcription_service.transcribe_file(audio_file)
+    from rich.live import Live
     
-    if text is None:
-        console.print("[red]Transcription failed[/red]")
+    # Show segments as they are decoded instead of waiting for the whole file
+    chunks = []
+    try:
+        with Live(Panel("", title="Transcription"), console=console) as live:
+            for chunk in transcription_service.transcribe_file_stream(audio_file):
+                chunks.append(chunk)
+                live.update(Panel(" ".join(chunks), title="Transcription"))
+    except RuntimeError as e:
+        # Don't offer to save a cut-off transcript
+        console.print(f"[red]Transcription failed: {e}[/red]")
         raise typer.Exit(1)
+    if not console.is_terminal:
+        console.line()
     
-    console.print(Panel(text, title="Transcription"))
+    text = " ".join(chunks)
+    
+    if not text:
+        console.print("[red]Transcription failed[/red]")
+        raise typer.Exit(1)
     
     # Offer to save to entry
     if typer.confirm("Add to today's notes?"):
@@ -255,6 +353,65 @@ def transcribe(
             console.print("[green]✓ Added to notes[/green]")
 
 
+@app.command()
+def transcribe_batch(
+    audio_files: list[Path] = typer.Argument(
+        ...,
+        help="Audio files to transcribe",
+        exists=True,
+    ),
+    date_str: Optional[str] = typer.Option(
+        None, "--date", "-d",
+        help="Date for all notes (YYYY-MM-DD). Defaults to each file's modification date.",
+    ),
+):
+    """Transcribe several audio files and add them to notes."""
+    from .services.storage import DiaryStorage
+    from .services.transcription import TranscriptionService
+    
+    fixed_date = parse_date(date_str) if date_str else None
+    
+    transcription_service = TranscriptionService()
+    
+    if not transcription_service.is_configured:
+        console.print("[red]Transcription not configured. Set OPENAI_API_KEY in .env[/red]")
+        raise typer.Exit(1)
+    
+    console.print(f"Transcribing {len(audio_files)} files...")
+    results = transcription_service.transcribe_files(audio_files)
+    
+    # Group successful transcriptions by the entry they belong to
+    notes_by_date: dict[date, list[str]] = {}
+    for audio_file, text in results.items():
+        if isinstance(text, Exception) or not text:
+            reason = text if isinstance(text, Exception) else "no speech found"
+            console.print(f"[red]✗ {audio_file.name}: {reason}[/red]")
+            continue
+        
+        entry_date = fixed_date or date.fromtimestamp(audio_file.stat().st_mtime)
+        notes_by_date.setdefault(entry_date, []).append(text)
+        console.print(Panel(text, title=f"{audio_file.name} ({entry_date})"))
+    
+    if not notes_by_date:
+        console.print("[red]Transcription failed[/red]")
+        raise typer.Exit(1)
+    
+    if typer.confirm(f"Add to notes for {len(notes_by_date)} day(s)?"):
+        # One storage session for every entry touched
+        with DiaryStorage() as storage:
+            for entry_date, texts in sorted(notes_by_date.items()):
+                entry = storage.get_or_create_entry(entry_date)
+                
+                for text in texts:
+                    if entry.general_notes:
+                        entry.general_notes += f"\n\n[Voice note]\n{text}"
+                    else:
+                        entry.general_notes = f"[Voice note]\n{text}"
+                
+                storage.save_entry(entry)
+        console.print("[green]✓ Added to notes[/green]")
+
+
 @app.command()
 def status():
     """Show configuration and integration status."""
@@ -301,6 +458,27 @@ def web(
     )
 
 
+async def _run_concurrently(jobs: dict, on_done: Optional[Callable[[str], None]] = None) -> dict:
+    """Run blocking fetch callables in threads at once; exceptions are returned, not raised.
+    
+    on_done, if given, is called from the worker thread with each job's name as it finishes.
+    """
+    import asyncio
+    
+    def run(name: str, job: Callable):
+        try:
+            return job()
+        finally:
+            if on_done:
+                on_done(name)
+    
+    results = await asyncio.gather(
+        *(asyncio.to_thread(run, name, job) for name, job in jobs.items()),
+        return_exceptions=True,
+    )
+    return dict(zip(jobs, results))
+
+
 @app.command()
 def fetch(
     date_str: Optional[str] = typer.Argument(
@@ -313,75 +491,125 @@ def fetch(
     ),
 ):
     """Fetch integration data (weather, Strava, Oura) for a date."""
+    import asyncio
+    from functools import partial
+    
     from .clients import OuraClient, StravaClient, WeatherClient
+    from .services.storage import DiaryStorage
     
     entry_date = parse_date(date_str)
     
+    # The clients share one keep-alive pool (clients.http.get_http_client)
     with DiaryStorage() as storage:
         entry = storage.get_or_create_entry(entry_date)
         
-        # Weather
+        # Collect the integrations that need fetching, then run them concurrently
+        jobs = {}
+        
         if force or not entry.integrations.weather:
             weather = WeatherClient()
+            weather.use_cache = not force
             if weather.is_configured:
-                console.print("Fetching weather...", end=" ")
-                data = weather.get_weather_for_date(entry_date)
-                if data:
-                    entry.integrations.weather = data
-                    console.print(f"[green]✓[/green] {data.temp_avg_c:.0f}°C, {data.pressure_hpa} hPa")
-                else:
-                    console.print("[yellow]no data[/yellow]")
+                jobs["weather"] = partial(weather.get_weather_for_date, entry_date)
             else:
                 console.print("[dim]Weather not configured[/dim]")
         
-        # Strava
         if force or not entry.integrations.activities:
             strava = StravaClient()
+            strava.use_cache = not force
             if strava.is_configured:
-                console.print("Fetching Strava activities...", end=" ")
-                activities = strava.get_activities_for_date(entry_date)
-                if activities:
-                    entry.integrations.activities = activities
-                    total_mins = sum(a.duration_minutes for a in activities)
-                    console.print(f"[green]✓[/green] {len(activities)} activities ({total_mins:.0f} min)")
-                else:
-                    console.print("[yellow]no activities[/yellow]")
+                jobs["strava"] = partial(strava.get_activities_for_date, entry_date)
             else:
                 console.print("[dim]Strava not configured[/dim]")
         
-        # Oura
         if force or not entry.integrations.sleep:
             oura = OuraClient()
+            oura.use_cache = not force
             if oura.is_configured:
-                console.print("Fetching Oura sleep...", end=" ")
-                sleep = oura.get_sleep_for_date(entry_date)
-                if sleep:
+                jobs["oura"] = partial(oura.get_sleep_for_date, entry_date)
+            else:
+                console.print("[dim]Oura not configured[/dim]")
+        
+        results = {}
+        if jobs:
+            from rich.progress import Progress, SpinnerColumn, TextColumn
+            
+            # One live line per integration, ticked off as each call returns
+            with Progress(
+                SpinnerColumn(finished_text="[green]✓[/green]"),
+                TextColumn("{task.description}"),
+                console=console,
+                transient=True,
+                disable=not console.is_terminal,
+            ) as progress:
+                tasks = {name: progress.add_task(f"Fetching {name}...", total=1) for name in jobs}
+                results = asyncio.run(_run_concurrently(
+                    jobs,
+                    on_done=lambda name: progress.advance(tasks[name]),
+                ))
+        
+        # Buffer the status lines and write them out in one go
+        with console:
+            # Weather
+            if "weather" in results:
+                data = results["weather"]
+                console.print("Weather:", end=" ")
+                if isinstance(data, Exception):
+                    console.print(f"[red]error: {data}[/red]")
+                elif data:
+                    entry.integrations.weather = data
+                    console.print(f"[green]✓[/green] {data.temp_avg_c:.0f}°C, {data.pressure_hpa} hPa")
+                else:
+                    console.print("[yellow]no data[/yellow]")
+            
+            # Strava
+            if "strava" in results:
+                activities = results["strava"]
+                console.print("Strava activities:", end=" ")
+                if isinstance(activities, Exception):
+                    console.print(f"[red]error: {activities}[/red]")
+                elif activities:
+                    entry.integrations.activities = activities
+                    total_mins = sum(a.duration_minutes for a in activities)
+                    console.print(f"[green]✓[/green] {len(activities)} activities ({total_mins:.0f} min)")
+                else:
+                    console.print("[yellow]no activities[/yellow]")
+            
+            # Oura
+            if "oura" in results:
+                sleep = results["oura"]
+                console.print("Oura sleep:", end=" ")
+                if isinstance(sleep, Exception):
+                    console.print(f"[red]error: {sleep}[/red]")
+                elif sleep:
                     entry.integrations.sleep = sleep
                     console.print(f"[green]✓[/green] Sleep score: {sleep.sleep_score}")
                 else:
                     console.print("[yellow]no data[/yellow]")
-            else:
-                console.print("[dim]Oura not configured[/dim]")
-        
-        storage.save_entry(entry)
-        console.print(f"\n[green]✓ Entry updated for {entry_date}[/green]")
+            
+            storage.save_entry(entry)
+            console.print(f"\n[green]✓ Entry updated for {entry_date}[/green]")
 
 
 @app.command()
 def sync_db():
     """Sync all diary entries to the analytics database."""
     from .services.database import AnalyticsDB
+    from .services.storage import DiaryStorage
     
-    console.print("Syncing entries to analytics database...")
+    from rich.progress import track
     
     with DiaryStorage(sync_analytics=False) as storage:
-        entries = storage.db.all()
+        # Validated in one batch rather than entry by entry
+        entries = storage.get_all_entries()
         
+        # Every entry goes in under one transaction (one commit at the end)
         with AnalyticsDB() as analytics:
-            for entry_dict in entries:
-                entry = DiaryEntry.model_validate(entry_dict)
-                analytics.upsert_entry(entry)
-                console.print(f"  ✓ {entry.entry_date}")
+            analytics.upsert_entries(track(
+                entries,
+                description="Syncing entries to analytics database...",
+                console=console,
+            ))
     
     console.print(f"\n[green]✓ Synced {len(entries)} entries to analytics.db[/green]")
 
@@ -406,7 +634,6 @@ def correlations(
     days: int = typer.Option(90, "--days", "-n", help="Number of days to analyze"),
 ):
     """Show correlation analysis from analytics database."""
-    import pandas as pd
     from .services.database import AnalyticsDB
     from datetime import timedelta
     
@@ -420,49 +647,51 @@ def correlations(
             console.print("[yellow]No data in analytics database. Run 'diary sync-db' first.[/yellow]")
             return
         
-        console.print(f"\n[bold]Data from {start_date} to {end_date} ({len(df)} days)[/bold]\n")
-        
-        # Key correlations with symptoms
-        if 'worst_symptom_severity' in df.columns:
-            target = 'worst_symptom_severity'
-            correlations = []
-            
-            factors = [
-                ('pressure_hpa', 'Pressure'),
-                ('sleep_score', 'Sleep Score'),
-                ('hrv_average', 'HRV'),
-                ('total_sleep_minutes', 'Sleep Duration'),
-                ('total_activity_minutes', 'Activity'),
-                ('alcohol_units', 'Alcohol'),
-                ('temp_avg_c', 'Temperature'),
-            ]
+        # Buffer output so the header and table are written together
+        with console:
+            console.print(f"\n[bold]Data from {start_date} to {end_date} ({len(df)} days)[/bold]\n")
             
-            for col, name in factors:
-                if col in df.columns and df[col].notna().sum() >= 5:
-                    corr = df[target].corr(df[col])
-                    if not pd.isna(corr):
-                        correlations.append((name, corr))
-            
-            correlations.sort(key=lambda x: abs(x[1]), reverse=True)
-            
-            table = Table(title=f"Correlations with Symptom Severity (last {days} days)")
-            table.add_column("Factor", style="cyan")
-            table.add_column("Correlation", justify="right")
-            table.add_column("Interpretation", style="dim")
-            
-            for name, corr in correlations:
-                color = "green" if corr < 0 else "red"
-                interp = "protective" if corr < 0 else "risk factor"
-                strength = "weak" if abs(corr) < 0.3 else "moderate" if abs(corr) < 0.5 else "strong"
-                table.add_row(
-                    name,
-                    f"[{color}]{corr:+.3f}[/{color}]",
-                    f"{strength} {interp}",
-                )
-            
-            console.print(table)
-        else:
-            console.print("[yellow]No symptom data found for correlation analysis.[/yellow]")
+            # Key correlations with symptoms
+            if 'worst_symptom_severity' in df.columns:
+                target = 'worst_symptom_severity'
+                
+                factors = [
+                    ('pressure_hpa', 'Pressure'),
+                    ('sleep_score', 'Sleep Score'),
+                    ('hrv_average', 'HRV'),
+                    ('total_sleep_minutes', 'Sleep Duration'),
+                    ('total_activity_minutes', 'Activity'),
+                    ('alcohol_units', 'Alcohol'),
+                    ('temp_avg_c', 'Temperature'),
+                ]
+                
+                # One vectorized pass over every factor with enough data
+                cols = [col for col, _ in factors if col in df.columns]
+                cols = [col for col in cols if df[col].count() >= 5]
+                corrs = df[cols].corrwith(df[target]).dropna()
+                names = dict(factors)
+                correlations = [(names[col], corr) for col, corr in corrs.items()]
+                
+                correlations.sort(key=lambda x: abs(x[1]), reverse=True)
+                
+                table = Table(title=f"Correlations with Symptom Severity (last {days} days)")
+                table.add_column("Factor", style="cyan")
+                table.add_column("Correlation", justify="right")
+                table.add_column("Interpretation", style="dim")
+                
+                for name, corr in correlations:
+                    color = "green" if corr < 0 else "red"
+                    interp = "protective" if corr < 0 else "risk factor"
+                    strength = "weak" if abs(corr) < 0.3 else "moderate" if abs(corr) < 0.5 else "strong"
+                    table.add_row(
+                        name,
+                        Text(f"{corr:+.3f}", style=color),
+                        f"{strength} {interp}",
+                    )
+                
+                console.print(table)
+            else:
+                console.print("[yellow]No symptom data found for correlation analysis.[/yellow]")
 
 
 @app.command()
@@ -489,12 +718,8 @@ def tables():
             "incidents", "weather", "vitals", "medications", "supplements", "hydration"
         ]
         
-        for tbl in table_names:
-            try:
-                count = analytics.query(f"SELECT COUNT(*) as n FROM {tbl}")["n"][0]
-                table.add_row(tbl, str(count))
-            except Exception:
-                table.add_row(tbl, "-")
+        for tbl, count in analytics.get_row_counts(table_names).items():
+            table.add_row(tbl, "-" if count is None else str(count))
         
         console.print(table)
 
@@ -505,6 +730,7 @@ def log_meal(
     meal_type: str = typer.Option("snack", "--type", "-t", help="Meal type: breakfast, lunch, dinner, snack"),
     date_str: Optional[str] = typer.Option(None, "--date", "-d", help="Date (YYYY-MM-DD), defaults to today"),
     no_estimate: bool = typer.Option(False, "--no-estimate", help="Skip LLM nutrition estimation"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-estimate even if this meal was logged before"),
 ):
     """Log a meal with automatic nutrition estimation."""
     from .services.nutrition import NutritionEstimator
@@ -518,7 +744,7 @@ def log_meal(
     with AnalyticsDB() as analytics:
         nutrition = {}
         if not no_estimate:
-            cached = analytics.find_cached_meal_nutrition(description, meal_type)
+            cached = None if no_cache else analytics.find_cached_meal_nutrition(description, meal_type)
             if cached:
                 nutrition = cached
                 console.print(f"[cyan]✓ Using cached nutrition (identical meal logged previously)[/cyan]")
@@ -580,13 +806,7 @@ def nutrition(
             console.print("[yellow]No meal data found. Log meals with 'diary log-meal'[/yellow]")
             return
         
-        table = Table(title=f"Nutrition Summary (last {days} days)")
-        table.add_column("Date", style="cyan")
-        table.add_column("Meals", justify="right")
-        table.add_column("Calories", justify="right")
-        table.add_column("Protein", justify="right")
-        table.add_column("Carbs", justify="right")
-        table.add_column("Fat", justify="right")
+        table = _make_table(f"Nutrition Summary (last {days} days)", _NUTRITION_COLUMNS)
         
         for _, row in df.iterrows():
             table.add_row(
@@ -619,14 +839,7 @@ def sleep_trends(
             console.print("[yellow]No sleep data found. Fetch data with 'diary fetch'[/yellow]")
             return
         
-        table = Table(title=f"Sleep Trends (last {days} days)")
-        table.add_column("Date", style="cyan")
-        table.add_column("Score", justify="right")
-        table.add_column("Duration", justify="right")
-        table.add_column("Deep", justify="right")
-        table.add_column("REM", justify="right")
-        table.add_column("HRV", justify="right")
-        table.add_column("Efficiency", justify="right")
+        table = _make_table(f"Sleep Trends (last {days} days)", _SLEEP_COLUMNS)
         
         for _, row in df.iterrows():
             hours = int(row['total_sleep_minutes'] // 60) if row['total_sleep_minutes'] else 0
@@ -649,94 +862,86 @@ def sleep_trends(
 def db_stats():
     """Show database statistics and table sizes."""
     from .services.database import AnalyticsDB
-    import os
     
     with AnalyticsDB() as analytics:
         db_path = analytics.db_path
         
-        # File size
-        file_size = os.path.getsize(db_path) if db_path.exists() else 0
-        console.print(f"\n[bold]Database:[/bold] {db_path}")
-        console.print(f"[bold]File size:[/bold] {file_size / 1024 / 1024:.2f} MB")
-        
-        # Check WAL file size
-        wal_path = Path(str(db_path) + ".wal")
-        if wal_path.exists():
-            wal_size = os.path.getsize(wal_path)
-            console.print(f"[bold]WAL file:[/bold] {wal_size / 1024 / 1024:.2f} MB")
-        
-        # Table row counts
-        console.print("\n[bold]Table Statistics:[/bold]")
-        table = Table()
-        table.add_column("Table", style="cyan")
-        table.add_column("Rows", justify="right")
-        table.add_column("Est. Size", justify="right")
-        
-        tables = [
-            "sleep", "activities", "meals", "symptoms", "incidents",
-            "weather", "vitals", "medications", "supplements", 
-            "hydration", "daily_summary", "consultations"
-        ]
-        
-        total_rows = 0
-        for tbl in tables:
-            try:
-                result = analytics.conn.execute(f"SELECT COUNT(*) FROM {tbl}").fetchone()
-                count = result[0] if result else 0
+        # Buffer output; the stats are written once all queries have run
+        with console:
+            # File size
+            file_size = _file_size(db_path)
+            console.print(f"\n[bold]Database:[/bold] {db_path}")
+            console.print(f"[bold]File size:[/bold] {file_size / 1024 / 1024:.2f} MB")
+            
+            # Check WAL file size
+            wal_size = _file_size(Path(str(db_path) + "-wal"))  # SQLite uses -wal not .wal
+            if wal_size:
+                console.print(f"[bold]WAL file:[/bold] {wal_size / 1024 / 1024:.2f} MB")
+            
+            # Table row counts
+            console.print("\n[bold]Table Statistics:[/bold]")
+            table = Table()
+            table.add_column("Table", style="cyan")
+            table.add_column("Rows", justify="right")
+            table.add_column("Est. Size", justify="right")
+            
+            tables = [
+                "sleep", "activities", "meals", "symptoms", "incidents",
+                "weather", "vitals", "medications", "supplements", 
+                "hydration", "daily_summary", "consultations"
+            ]
+            
+            sizes = analytics.get_table_sizes(tables)
+            
+            total_rows = 0
+            for tbl, count in analytics.get_row_counts(tables).items():
+                if count is None:
+                    table.add_row(tbl, "-", "-")
+                    continue
                 total_rows += count
                 
-                # Estimate size (rough approximation)
-                if count > 0:
-                    # Get average row size by sampling
-                    try:
-                        size_result = analytics.conn.execute(f"""
-                            SELECT AVG(LENGTH(CAST(* AS VARCHAR))) FROM {tbl} LIMIT 100
-                        """).fetchone()
-                        avg_size = size_result[0] if size_result and size_result[0] else 100
-                        est_size = count * avg_size / 1024  # KB
-                        size_str = f"{est_size:.1f} KB" if est_size < 1024 else f"{est_size/1024:.2f} MB"
-                    except Exception:
-                        size_str = "-"
+                # Size from SQLite's page catalog (no row scan)
+                size_bytes = sizes[tbl]
+                if size_bytes is None:
+                    size_str = "-"
                 else:
-                    size_str = "0"
+                    est_size = size_bytes / 1024  # KB
+                    size_str = f"{est_size:.1f} KB" if est_size < 1024 else f"{est_size/1024:.2f} MB"
                 
                 table.add_row(tbl, str(count), size_str)
+            
+            console.print(table)
+            console.print(f"\n[dim]Total rows: {total_rows}[/dim]")
+            
+            # Check consultations specifically (likely culprit)
+            try:
+                conv_result = analytics.conn.execute("""
+                    SELECT COUNT(*), SUM(LENGTH(conversation_json)) / 1024.0 / 1024.0 as mb
+                    FROM consultations 
+                    WHERE conversation_json IS NOT NULL
+                """).fetchone()
+                if conv_result and conv_result[0] > 0:
+                    console.print(f"\n[yellow]Conversation transcripts: {conv_result[0]} consultations, {conv_result[1]:.2f} MB[/yellow]")
             except Exception:
-                table.add_row(tbl, "-", "-")
-        
-        console.print(table)
-        console.print(f"\n[dim]Total rows: {total_rows}[/dim]")
-        
-        # Check consultations specifically (likely culprit)
-        try:
-            conv_result = analytics.conn.execute("""
-                SELECT COUNT(*), SUM(LENGTH(conversation_json)) / 1024.0 / 1024.0 as mb
-                FROM consultations 
-                WHERE conversation_json IS NOT NULL
-            """).fetchone()
-            if conv_result and conv_result[0] > 0:
-                console.print(f"\n[yellow]Conversation transcripts: {conv_result[0]} consultations, {conv_result[1]:.2f} MB[/yellow]")
-        except Exception:
-            pass
-        
-        if wal_path.exists() and wal_size > 1024 * 1024:  # > 1MB
-            console.print(f"\n[yellow]💡 Run 'diary db-compact' to reclaim WAL space[/yellow]")
+                pass
+            
+            if wal_size > 1024 * 1024:  # > 1MB
+                console.print(f"\n[yellow]💡 Run 'diary db-compact' to reclaim WAL space[/yellow]")
 
 
 @app.command()
 def db_compact():
     """Compact database and reclaim disk space."""
     from .services.database import AnalyticsDB
-    import os
     
     with AnalyticsDB() as analytics:
         db_path = analytics.db_path
         
         # Size before
-        size_before = os.path.getsize(db_path) if db_path.exists() else 0
+        size_before = _file_size(db_path)
         wal_path = Path(str(db_path) + "-wal")  # SQLite uses -wal not .wal
         shm_path = Path(str(db_path) + "-shm")
-        wal_before = os.path.getsize(wal_path) if wal_path.exists() else 0
+        wal_before = _file_size(wal_path)
         
         console.print(f"[dim]Before: {(size_before + wal_before) / 1024 / 1024:.2f} MB[/dim]")
         
@@ -748,8 +953,8 @@ def db_compact():
         analytics.conn.execute("VACUUM")
         
         # Size after
-        size_after = os.path.getsize(db_path) if db_path.exists() else 0
-        wal_after = os.path.getsize(wal_path) if wal_path.exists() else 0
+        size_after = _file_size(db_path)
+        wal_after = _file_size(wal_path)
         
         saved = (size_before + wal_before) - (size_after + wal_after)
         console.print(f"[dim]After: {(size_after + wal_after) / 1024 / 1024:.2f} MB[/dim]")
@@ -0,0 +1,77 @@
+"""Shared plumbing for the integration API clients."""
+
+from typing import Optional, Self
+
+import httpx
+
+from ..utils.config import Settings, get_settings
+from .http import HTTP2, aget_with_retry, get_http_client, get_with_retry
+
+
+class BaseAPIClient:
+    """
+    HTTP client handling common to Weather, Strava and Oura.
+    
+    Sync requests go through the process-wide keep-alive pool unless a client
+    is injected; async requests use a per-instance AsyncClient, closed by
+    `aclose()` / `async with`. Both retry rate-limited responses.
+    """
+    
+    # Set False to bypass the response cache (e.g. forced re-fetch)
+    use_cache = True
+    
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        http_client: Optional[httpx.Client] = None,
+    ):
+        self.settings = settings or get_settings()
+        # Defaults to the process-wide keep-alive pool; the owner of either closes it
+        self._client: Optional[httpx.Client] = http_client
+        self._aclient: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = get_http_client()
+        return self._client
+    
+    @property
+    def aclient(self) -> httpx.AsyncClient:
+        # Bound to the running event loop. Over HTTP/2, concurrent requests
+        # multiplex on one connection
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                http2=HTTP2,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            )
+        return self._aclient
+    
+    def _get(self, url: str, **kwargs) -> httpx.Response:
+        return get_with_retry(self.client, url, **kwargs)
+    
+    async def _aget(self, url: str, **kwargs) -> httpx.Response:
+        return await aget_with_retry(self.aclient, url, **kwargs)
+    
+    def close(self) -> None:
+        """Release the HTTP client (the pool itself is left open for reuse)."""
+        self._client = None
+    
+    def __enter__(self) -> Self:
+        return self
+    
+    def __exit__(self, *args) -> None:
+        self.close()
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+        self._aclient = None
+    
+    async def __aenter__(self) -> Self:
+        return self
+    
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
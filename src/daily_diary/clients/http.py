@@ -0,0 +1,76 @@
+"""Shared HTTP connection pool for the integration clients."""
+
+import asyncio
+import atexit
+import random
+import time
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Optional
+
+import httpx
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1
+HTTP2 = find_spec("h2") is not None
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Get the process-wide httpx client.
+    
+    Clients that aren't handed one explicitly share this pool, so repeat
+    requests to the same host reuse keep-alive TCP/TLS connections.
+    """
+    client = httpx.Client(
+        http2=HTTP2,
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=30.0),
+    )
+    # Lives for the whole process; close the pooled sockets on the way out
+    atexit.register(client.close)
+    return client
+
+
+# Rate-limited / briefly unavailable responses worth another attempt
+RETRY_STATUSES = {429, 502, 503, 504}
+MAX_ATTEMPTS = 4
+# Longer waits (e.g. Strava's 15-minute window) aren't worth blocking a run on
+MAX_RETRY_WAIT = 60.0
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying, or None to hand the response back."""
+    if response.status_code not in RETRY_STATUSES or attempt + 1 >= MAX_ATTEMPTS:
+        return None
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        delay = float(retry_after)
+    else:
+        # Exponential backoff with jitter: ~1s, 2s, 4s
+        delay = 2 ** attempt + random.uniform(0, 1)
+    return delay if delay <= MAX_RETRY_WAIT else None
+
+
+def get_with_retry(client: httpx.Client, url: str, **kwargs) -> httpx.Response:
+    """GET that backs off and retries on 429/5xx, honouring Retry-After."""
+    attempt = 0
+    while True:
+        response = client.get(url, **kwargs)
+        delay = _retry_delay(response, attempt)
+        if delay is None:
+            return response
+        time.sleep(delay)
+        attempt += 1
+
+
+async def aget_with_retry(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """Async version of get_with_retry."""
+    attempt = 0
+    while True:
+        response = await client.get(url, **kwargs)
+        delay = _retry_delay(response, attempt)
+        if delay is None:
+            return response
+        await asyncio.sleep(delay)
+        attempt += 1
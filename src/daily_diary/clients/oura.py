@@ -1,15 +1,27 @@
 """Oura Ring API client."""
 
-from datetime import date, datetime
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 
 import httpx
 
 from ..models.integrations import SleepData
-from ..utils.config import Settings, get_settings
+from ..utils.config import Settings
+from ..utils.response_cache import DAY, HOUR, cached_by_date
+from ..utils.token_cache import get_token_cache
+from .base import BaseAPIClient
 
+logger = logging.getLogger(__name__)
 
-class OuraClient:
+
+def _sleep_ttl(target_date: date) -> float:
+    # Sleep for past days is settled; today's may still be syncing from the ring
+    return DAY if target_date < date.today() else HOUR
+
+
+class OuraClient(BaseAPIClient):
     """
     Client for fetching sleep and readiness data from Oura Ring.
     
@@ -21,17 +33,14 @@ class OuraClient:
     API_URL = "https://api.ouraring.com/v2"
     AUTH_URL = "https://api.ouraring.com/oauth/token"
     
-    def __init__(self, settings: Optional[Settings] = None):
-        self.settings = settings or get_settings()
-        self._client: Optional[httpx.Client] = None
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        http_client: Optional[httpx.Client] = None,
+    ):
+        super().__init__(settings, http_client)
         self._access_token: Optional[str] = None
     
-    @property
-    def client(self) -> httpx.Client:
-        if self._client is None:
-            self._client = httpx.Client(timeout=30.0)
-        return self._client
-    
     @property
     def is_configured(self) -> bool:
         # Either PAT or OAuth2 credentials
@@ -53,6 +62,12 @@ class OuraClient:
         """Refresh OAuth2 access token."""
         if self._access_token:
             return self._access_token
+        
+        # A previous run may have left a still-valid token on disk
+        cached = get_token_cache().load("oura")
+        if cached:
+            self._access_token = cached[0]
+            return self._access_token
             
         try:
             response = self.client.post(
@@ -67,9 +82,12 @@ class OuraClient:
             response.raise_for_status()
             data = response.json()
             self._access_token = data.get("access_token")
+            if self._access_token and data.get("expires_in"):
+                expires_at = datetime.now(timezone.utc) + timedelta(seconds=data["expires_in"])
+                get_token_cache().save("oura", self._access_token, expires_at)
             return self._access_token
         except httpx.HTTPError as e:
-            print(f"Oura OAuth error: {e}")
+            logger.warning("Oura OAuth error: %s", e)
             return None
     
     def _get_headers(self) -> dict[str, str]:
@@ -77,99 +95,152 @@ class OuraClient:
         token = self._get_access_token()
         return {"Authorization": f"Bearer {token}"} if token else {}
     
+    @cached_by_date("oura", Optional[SleepData], ttl=_sleep_ttl)
     def get_sleep_for_date(self, target_date: date) -> Optional[SleepData]:
         """
         Fetch sleep data for a specific date.
         
         Note: Oura's 'day' field = the date you woke up.
         Sleep for night of Dec 23→24 has day='2025-12-24'.
+        """
+        return self.get_sleep_range(target_date, target_date).get(target_date)
+    
+    def get_sleep_range(self, start: date, end: date) -> dict[date, SleepData]:
+        """
+        Fetch sleep data for every day in [start, end], keyed by Oura's 'day'.
         
-        The API end_date is exclusive, so we query [target_date, target_date+1).
+        Two requests (sleep + daily_sleep) cover the whole range, so a
+        backfill costs the same round-trips as a single day.
         """
         if not self.is_configured:
-            return None
+            return {}
         
         token = self._get_access_token()
         if not token:
-            print("Oura: Could not get access token")
-            return None
+            logger.warning("Oura: Could not get access token")
+            return {}
         
-        from datetime import timedelta
-        end_date = target_date + timedelta(days=1)
+        headers = {"Authorization": f"Bearer {token}"}
+        params = self._range_params(start, end)
         
         try:
             # Get detailed sleep data
-            response = self.client.get(
-                f"{self.API_URL}/usercollection/sleep",
-                headers={"Authorization": f"Bearer {token}"},
-                params={
-                    "start_date": target_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                },
+            response = self._get(
+                f"{self.API_URL}/usercollection/sleep", headers=headers, params=params
             )
             response.raise_for_status()
             data = response.json()
             
             if not data.get("data"):
-                return None
-            
-            # Get the main sleep period (longest one)
-            sleep_periods = data["data"]
-            main_sleep = max(sleep_periods, key=lambda x: x.get("total_sleep_duration", 0))
+                return {}
             
-            # Also fetch daily_sleep for the score
-            score_response = self.client.get(
-                f"{self.API_URL}/usercollection/daily_sleep",
-                headers={"Authorization": f"Bearer {token}"},
-                params={
-                    "start_date": target_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                },
+            # Also fetch daily_sleep for the scores
+            score_response = self._get(
+                f"{self.API_URL}/usercollection/daily_sleep", headers=headers, params=params
             )
             score_response.raise_for_status()
-            score_data = score_response.json()
             
-            sleep_score = None
-            if score_data.get("data"):
-                sleep_score = score_data["data"][0].get("score")
-            
-            return self._parse_sleep(main_sleep, sleep_score)
+            return self._parse_sleep_range(data, score_response.json())
         except httpx.HTTPError as e:
-            print(f"Oura API error: {e}")
-            return None
+            logger.warning("Oura API error: %s", e)
+            return {}
     
-    def get_readiness_for_date(self, target_date: date) -> Optional[int]:
-        """Fetch readiness score for a specific date."""
+    async def get_sleep_for_date_async(self, target_date: date) -> Optional[SleepData]:
+        """Fetch sleep data for a specific date on the async client.
+        
+        Same result as get_sleep_for_date(), but the sleep and daily_sleep
+        requests are issued concurrently instead of one after another.
+        """
         if not self.is_configured:
             return None
         
         token = self._get_access_token()
         if not token:
+            logger.warning("Oura: Could not get access token")
             return None
         
+        headers = {"Authorization": f"Bearer {token}"}
+        params = self._range_params(target_date, target_date)
+        
+        try:
+            response, score_response = await asyncio.gather(
+                self._aget(
+                    f"{self.API_URL}/usercollection/sleep", headers=headers, params=params
+                ),
+                self._aget(
+                    f"{self.API_URL}/usercollection/daily_sleep", headers=headers, params=params
+                ),
+            )
+            response.raise_for_status()
+            score_response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning("Oura API error: %s", e)
+            return None
+        
+        data = response.json()
+        if not data.get("data"):
+            return None
+        return self._parse_sleep_range(data, score_response.json()).get(target_date)
+    
+    @staticmethod
+    def _range_params(start: date, end: date) -> dict[str, str]:
         # End date is exclusive in Oura API, so add 1 day
-        from datetime import timedelta
-        end_date = target_date + timedelta(days=1)
+        return {
+            "start_date": start.isoformat(),
+            "end_date": (end + timedelta(days=1)).isoformat(),
+        }
+    
+    def _parse_sleep_range(self, data: dict, score_data: dict) -> dict[date, SleepData]:
+        """Pick each day's main sleep period and attach its daily_sleep score."""
+        # Get the main sleep period (longest one) per day
+        main_sleep: dict[str, dict] = {}
+        for period in data.get("data", []):
+            day = period.get("day")
+            if day is None:
+                continue
+            current = main_sleep.get(day)
+            if current is None or (
+                period.get("total_sleep_duration", 0) > current.get("total_sleep_duration", 0)
+            ):
+                main_sleep[day] = period
+        
+        scores = {s.get("day"): s.get("score") for s in score_data.get("data", [])}
+        
+        return {
+            date.fromisoformat(day): self._parse_sleep(period, scores.get(day))
+            for day, period in main_sleep.items()
+        }
+    
+    def get_readiness_for_date(self, target_date: date) -> Optional[int]:
+        """Fetch readiness score for a specific date."""
+        return self.get_readiness_range(target_date, target_date).get(target_date)
+    
+    def get_readiness_range(self, start: date, end: date) -> dict[date, int]:
+        """Fetch readiness scores for every day in [start, end] in one request."""
+        if not self.is_configured:
+            return {}
+        
+        token = self._get_access_token()
+        if not token:
+            return {}
         
         try:
-            response = self.client.get(
+            response = self._get(
                 f"{self.API_URL}/usercollection/daily_readiness",
                 headers={"Authorization": f"Bearer {token}"},
-                params={
-                    "start_date": target_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                },
+                params=self._range_params(start, end),
             )
             response.raise_for_status()
             data = response.json()
             
-            if not data.get("data"):
-                return None
-            
-            return data["data"][0].get("score")
+            return {
+                date.fromisoformat(r["day"]): r["score"]
+                for r in data.get("data", [])
+                if r.get("day") and r.get("score") is not None
+            }
         except httpx.HTTPError as e:
-            print(f"Oura API error: {e}")
-            return None
+            logger.warning("Oura API error: %s", e)
+            return {}
     
     def _parse_sleep(self, data: dict, sleep_score: Optional[int] = None) -> SleepData:
         """Parse Oura API response into SleepData model."""
@@ -193,15 +264,3 @@ class OuraClient:
             respiratory_rate=data.get("average_breath"),
             restless_periods=data.get("restless_periods"),
         )
-    
-    def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client:
-            self._client.close()
-            self._client = None
-    
-    def __enter__(self) -> "OuraClient":
-        return self
-    
-    def __exit__(self, *args) -> None:
-        self.close()
@@ -1,32 +1,77 @@
 """Strava API client."""
 
+import asyncio
+import json
+import logging
 from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 
 import httpx
 
 from ..models.integrations import ActivityData
-from ..utils.config import Settings, get_settings
+from ..utils.config import Settings
+from ..utils.response_cache import DAY, HOUR, cached_by_date, get_response_cache
+from ..utils.token_cache import get_token_cache
+from .base import BaseAPIClient
 
+logger = logging.getLogger(__name__)
 
-class StravaClient:
+# Activity types where measured work (kJ) is a fair stand-in for kcal burned
+_CYCLING_TYPES = {"Ride", "VirtualRide", "EBikeRide"}
+
+
+def _calories(data: dict) -> Optional[float]:
+    """Best calorie figure in a summary or detail payload, if any."""
+    # Strava provides kilojoules for power-based activities
+    # and calories for estimated calorie burn
+    # kilojoules ≈ calories for cycling (due to ~25% human efficiency)
+    if data.get("kilojoules"):
+        # For activities with power data, kilojoules ≈ kcal
+        return data.get("kilojoules")
+    if data.get("calories"):
+        # Some activities have direct calorie estimate
+        return data.get("calories")
+    is_ride = (data.get("sport_type") or data.get("type")) in _CYCLING_TYPES
+    measured_power = data.get("device_watts") and data.get("average_watts")
+    if is_ride and measured_power and data.get("moving_time"):
+        # Power-meter ride without a kilojoule total: work = watts × seconds
+        return data["average_watts"] * data["moving_time"] / 1000
+    return None
+
+
+def _needs_detail(summary: dict) -> bool:
+    # Power-meter rides already carry enough in the list summary; the
+    # detail call is only worth its round-trip when calories are missing.
+    # Skipped activities have no description - AnalyticsDB.upsert_entry
+    # keeps any description already stored for them
+    return _calories(summary) is None
+
+
+def _remaining_requests(response: httpx.Response) -> Optional[int]:
+    # X-RateLimit-Limit / X-RateLimit-Usage are "<15-minute>,<daily>" pairs
+    try:
+        limits = [int(x) for x in response.headers["X-RateLimit-Limit"].split(",")]
+        usage = [int(x) for x in response.headers["X-RateLimit-Usage"].split(",")]
+    except (KeyError, ValueError):
+        return None
+    return min(limit - used for limit, used in zip(limits, usage))
+
+
+class StravaClient(BaseAPIClient):
     """Client for fetching activity data from Strava."""
     
     AUTH_URL = "https://www.strava.com/oauth/token"
     API_URL = "https://www.strava.com/api/v3"
     
-    def __init__(self, settings: Optional[Settings] = None):
-        self.settings = settings or get_settings()
-        self._client: Optional[httpx.Client] = None
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        http_client: Optional[httpx.Client] = None,
+    ):
+        super().__init__(settings, http_client)
         self._access_token: Optional[str] = None
         self._token_expires_at: Optional[datetime] = None
     
-    @property
-    def client(self) -> httpx.Client:
-        if self._client is None:
-            self._client = httpx.Client(timeout=30.0)
-        return self._client
-    
     @property
     def is_configured(self) -> bool:
         return self.settings.has_strava
@@ -53,9 +98,10 @@ class StravaClient:
             self._token_expires_at = datetime.fromtimestamp(
                 data["expires_at"], tz=timezone.utc
             )
+            get_token_cache().save("strava", self._access_token, self._token_expires_at)
             return True
         except httpx.HTTPError as e:
-            print(f"Strava auth error: {e}")
+            logger.warning("Strava auth error: %s", e)
             return False
     
     def _ensure_valid_token(self) -> bool:
@@ -64,12 +110,20 @@ class StravaClient:
             # Refresh if expiring in less than 5 minutes
             if datetime.now(timezone.utc) < self._token_expires_at - timedelta(minutes=5):
                 return True
+        
+        # A previous run may have left a still-valid token on disk
+        cached = get_token_cache().load("strava")
+        if cached:
+            self._access_token, self._token_expires_at = cached
+            return True
         return self._refresh_access_token()
     
     def _get_headers(self) -> dict[str, str]:
         """Get authorization headers."""
         return {"Authorization": f"Bearer {self._access_token}"}
     
+    # Activities can still be edited/uploaded for a while, so keep this short
+    @cached_by_date("strava", list[ActivityData], ttl=lambda _: 4 * HOUR)
     def get_activities_for_date(self, target_date: date) -> list[ActivityData]:
         """Fetch all activities for a specific date."""
         if not self.is_configured or not self._ensure_valid_token():
@@ -80,7 +134,7 @@ class StravaClient:
         end_of_day = datetime.combine(target_date, datetime.max.time())
         
         try:
-            response = self.client.get(
+            response = self._get(
                 f"{self.API_URL}/athlete/activities",
                 headers=self._get_headers(),
                 params={
@@ -92,32 +146,56 @@ class StravaClient:
             response.raise_for_status()
             activities_data = response.json()
             
-            # Fetch detailed data for each activity to get calories
+            # Fetch detailed data for activities whose summary lacks calories
             results = []
             for summary in activities_data:
-                detailed = self._get_activity_detail(summary.get("id"))
+                detailed = None
+                if _needs_detail(summary):
+                    detailed = self._get_activity_detail(summary.get("id"))
                 if detailed:
                     results.append(self._parse_activity(detailed))
                 else:
                     results.append(self._parse_activity(summary))
             return results
         except httpx.HTTPError as e:
-            print(f"Strava API error: {e}")
+            logger.warning("Strava API error: %s", e)
             return []
     
+    def _cached_detail(self, activity_id: int) -> Optional[dict]:
+        if not self.use_cache:
+            return None
+        cached = get_response_cache().get(f"strava:activity:{activity_id}")
+        return json.loads(cached) if cached is not None else None
+    
+    def _cache_detail(self, activity_id: int, data: dict) -> None:
+        # Activities can be edited for a while after upload; only keep settled ones
+        start = data.get("start_date")
+        if not start:
+            return
+        started_at = datetime.fromisoformat(start)
+        if datetime.now(timezone.utc) - started_at > timedelta(days=1):
+            get_response_cache().set(
+                f"strava:activity:{activity_id}", json.dumps(data), ttl_seconds=365 * DAY
+            )
+    
     def _get_activity_detail(self, activity_id: int) -> Optional[dict]:
         """Fetch detailed activity data to get calories."""
         if not activity_id:
             return None
+        cached = self._cached_detail(activity_id)
+        if cached is not None:
+            return cached
         try:
-            response = self.client.get(
+            response = self._get(
                 f"{self.API_URL}/activities/{activity_id}",
                 headers=self._get_headers(),
             )
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            self._cache_detail(activity_id, data)
+            return data
         except httpx.HTTPError as e:
-            print(f"Strava detail fetch error for {activity_id}: {e}")
+            logger.warning("Strava detail fetch error for %s: %s", activity_id, e)
             return None
     
     def get_recent_activities(self, days: int = 7, fetch_details: bool = True) -> list[ActivityData]:
@@ -125,8 +203,9 @@ class StravaClient:
         
         Args:
             days: Number of days to look back
-            fetch_details: If True, fetch detailed data for each activity to get calories.
-                          This makes an extra API call per activity but gets accurate calorie data.
+            fetch_details: If True, fetch detailed data to get calories for activities
+                          whose summary has none (no kilojoules). This makes an extra
+                          API call per such activity but gets accurate calorie data.
         """
         if not self.is_configured or not self._ensure_valid_token():
             return []
@@ -134,7 +213,7 @@ class StravaClient:
         after_date = datetime.now() - timedelta(days=days)
         
         try:
-            response = self.client.get(
+            response = self._get(
                 f"{self.API_URL}/athlete/activities",
                 headers=self._get_headers(),
                 params={
@@ -146,10 +225,13 @@ class StravaClient:
             activities_data = response.json()
             
             if fetch_details:
-                # Fetch detailed data for each activity to get calories
+                # Fetch detailed data for activities whose summary lacks calories
                 results = []
                 for i, summary in enumerate(activities_data):
-                    print(f"  Fetching details for activity {i+1}/{len(activities_data)}...")
+                    if not _needs_detail(summary):
+                        results.append(self._parse_activity(summary))
+                        continue
+                    logger.debug("Fetching details for activity %d/%d", i + 1, len(activities_data))
                     detailed = self._get_activity_detail(summary.get("id"))
                     if detailed:
                         results.append(self._parse_activity(detailed))
@@ -159,22 +241,109 @@ class StravaClient:
             else:
                 return [self._parse_activity(a) for a in activities_data]
         except httpx.HTTPError as e:
-            print(f"Strava API error: {e}")
+            logger.warning("Strava API error: %s", e)
+            return []
+    
+    async def _get_activity_detail_async(self, activity_id: int) -> Optional[dict]:
+        """Fetch detailed activity data on the async client."""
+        if not activity_id:
+            return None
+        cached = self._cached_detail(activity_id)
+        if cached is not None:
+            return cached
+        try:
+            response = await self._aget(
+                f"{self.API_URL}/activities/{activity_id}",
+                headers=self._get_headers(),
+            )
+            response.raise_for_status()
+            data = response.json()
+            self._cache_detail(activity_id, data)
+            return data
+        except httpx.HTTPError as e:
+            logger.warning("Strava detail fetch error for %s: %s", activity_id, e)
+            return None
+    
+    async def _list_with_details_async(
+        self, params: dict, concurrency: int
+    ) -> list[ActivityData]:
+        """List activities, then fetch each one's details concurrently."""
+        try:
+            response = await self._aget(
+                f"{self.API_URL}/athlete/activities",
+                headers=self._get_headers(),
+                params=params,
+            )
+            response.raise_for_status()
+            activities_data = response.json()
+        except httpx.HTTPError as e:
+            logger.warning("Strava API error: %s", e)
+            return []
+        
+        # Back off concurrency as we approach Strava's rate limit
+        remaining = _remaining_requests(response)
+        if remaining is not None:
+            concurrency = max(1, min(concurrency, remaining // 4))
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_detail(summary: dict) -> ActivityData:
+            if not _needs_detail(summary):
+                return self._parse_activity(summary)
+            async with semaphore:
+                detailed = await self._get_activity_detail_async(summary.get("id"))
+            return self._parse_activity(detailed or summary)
+        
+        return list(await asyncio.gather(*(fetch_detail(a) for a in activities_data)))
+    
+    async def get_activities_for_date_async(
+        self, target_date: date, concurrency: int = 8
+    ) -> list[ActivityData]:
+        """Fetch all activities for a specific date with details fetched concurrently.
+        
+        Same result as get_activities_for_date(), on the async client.
+        """
+        if not self.is_configured or not self._ensure_valid_token():
+            return []
+        
+        start_of_day = datetime.combine(target_date, datetime.min.time())
+        end_of_day = datetime.combine(target_date, datetime.max.time())
+        
+        return await self._list_with_details_async(
+            {
+                "after": int(start_of_day.timestamp()),
+                "before": int(end_of_day.timestamp()),
+                "per_page": 50,
+            },
+            concurrency,
+        )
+    
+    async def get_recent_activities_async(
+        self, days: int = 7, concurrency: int = 8
+    ) -> list[ActivityData]:
+        """Fetch activities from the last N days with details fetched concurrently.
+        
+        Same result as get_recent_activities(fetch_details=True), but the
+        per-activity detail requests overlap instead of running one after another.
+        
+        Args:
+            days: Number of days to look back
+            concurrency: Maximum number of detail requests in flight at once
+        """
+        if not self.is_configured or not self._ensure_valid_token():
             return []
+        
+        after_date = datetime.now() - timedelta(days=days)
+        
+        return await self._list_with_details_async(
+            {
+                "after": int(after_date.timestamp()),
+                "per_page": 100,
+            },
+            concurrency,
+        )
     
     def _parse_activity(self, data: dict) -> ActivityData:
         """Parse Strava API response into ActivityData model."""
-        # Strava provides kilojoules for power-based activities
-        # and calories for estimated calorie burn
-        # kilojoules ≈ calories for cycling (due to ~25% human efficiency)
-        calories = None
-        if data.get("kilojoules"):
-            # For activities with power data, kilojoules ≈ kcal
-            calories = data.get("kilojoules")
-        elif data.get("calories"):
-            # Some activities have direct calorie estimate
-            calories = data.get("calories")
-        
         return ActivityData(
             activity_id=str(data.get("id")),
             activity_type=data.get("type", "Unknown"),
@@ -189,19 +358,7 @@ class StravaClient:
             average_power_watts=data.get("average_watts"),
             average_cadence=data.get("average_cadence"),
             suffer_score=data.get("suffer_score"),
-            calories_burned=calories,
-            start_time=datetime.fromisoformat(data["start_date_local"].replace("Z", "+00:00")) if data.get("start_date_local") else None,
+            calories_burned=_calories(data),
+            start_time=datetime.fromisoformat(data["start_date_local"]) if data.get("start_date_local") else None,
             description=data.get("description"),
         )
-    
-    def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client:
-            self._client.close()
-            self._client = None
-    
-    def __enter__(self) -> "StravaClient":
-        return self
-    
-    def __exit__(self, *args) -> None:
-        self.close()
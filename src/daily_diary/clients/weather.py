@@ -1,15 +1,42 @@
 """Weather API client using Open-Meteo (free, no API key required)."""
 
+import asyncio
+import logging
+from bisect import bisect_left
 from datetime import date, datetime, timedelta
 from typing import Optional
 
 import httpx
 
 from ..models.integrations import WeatherData
-from ..utils.config import Settings, get_settings
+from ..utils.response_cache import DAY, HOUR, cached_by_date
+from .base import BaseAPIClient
 
+logger = logging.getLogger(__name__)
 
-class WeatherClient:
+
+def _weather_ttl(target_date: date) -> float:
+    # Open-Meteo revises the last couple of days as observations come in;
+    # older days are final
+    if target_date >= date.today() - timedelta(days=2):
+        return HOUR
+    return 365 * DAY
+
+
+# Daily precipitation (mm) upper bounds for each label; above the last is heavy rain
+_PRECIP_THRESHOLDS = (0, 2, 10)
+_PRECIP_LABELS = ("Dry", "Light rain", "Rain", "Heavy rain")
+
+
+def _precip_description(precip_mm: float, precip_hours: float) -> str:
+    label = _PRECIP_LABELS[bisect_left(_PRECIP_THRESHOLDS, precip_mm)]
+    # Measurable hours with ~0 mm total
+    if label == "Dry" and precip_hours > 0:
+        return "Drizzle"
+    return label
+
+
+class WeatherClient(BaseAPIClient):
     """
     Client for fetching weather data from Open-Meteo.
     
@@ -20,16 +47,6 @@ class WeatherClient:
     
     BASE_URL = "https://api.open-meteo.com/v1/forecast"
     
-    def __init__(self, settings: Optional[Settings] = None):
-        self.settings = settings or get_settings()
-        self._client: Optional[httpx.Client] = None
-    
-    @property
-    def client(self) -> httpx.Client:
-        if self._client is None:
-            self._client = httpx.Client(timeout=30.0)
-        return self._client
-    
     @property
     def is_configured(self) -> bool:
         # Open-Meteo doesn't require API key, just lat/lon
@@ -51,102 +68,156 @@ class WeatherClient:
         
         Also calculates pressure_change_hpa from previous day.
         """
+        # Resolve the defaults first so the cache key always names the location
+        return self._weather_at(
+            target_date,
+            lat or self.settings.default_latitude,
+            lon or self.settings.default_longitude,
+        )
+    
+    @cached_by_date("weather", Optional[WeatherData], ttl=_weather_ttl)
+    def _weather_at(self, target_date: date, lat: float, lon: float) -> Optional[WeatherData]:
+        return self.get_weather_for_range(target_date, target_date, lat, lon).get(target_date)
+    
+    def get_weather_for_range(
+        self,
+        start: date,
+        end: date,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+    ) -> dict[date, WeatherData]:
+        """
+        Fetch daily weather summaries for every date in [start, end].
+        
+        One request covers the whole range (plus the day before start, for
+        pressure change), so a backfill costs a single round-trip.
+        """
         lat = lat or self.settings.default_latitude
         lon = lon or self.settings.default_longitude
         
-        # Fetch 2 days to calculate pressure change
-        start_date = target_date - timedelta(days=1)
-        end_date = target_date
-        
         try:
-            response = self.client.get(
-                self.BASE_URL,
-                params={
-                    "latitude": lat,
-                    "longitude": lon,
-                    "daily": [
-                        "temperature_2m_max",
-                        "temperature_2m_min",
-                        "temperature_2m_mean",
-                        "precipitation_sum",
-                        "precipitation_hours",
-                        "wind_speed_10m_max",
-                    ],
-                    "hourly": ["surface_pressure", "relative_humidity_2m"],
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                    "timezone": "auto",
-                },
-            )
+            response = self._get(self.BASE_URL, params=self._range_params(start, end, lat, lon))
             response.raise_for_status()
             data = response.json()
-            
-            daily = data.get("daily", {})
-            hourly = data.get("hourly", {})
-            
-            # Find index for target date in daily data
-            dates = daily.get("time", [])
-            try:
-                day_idx = dates.index(target_date.isoformat())
-            except ValueError:
-                return None
-            
-            # Get noon pressure for consistent comparison (index 12 for noon hour)
-            # Each day has 24 hours, so target day's noon is at index: day_idx * 24 + 12
-            pressures = hourly.get("surface_pressure", [])
-            humidities = hourly.get("relative_humidity_2m", [])
-            
-            noon_hour_idx = day_idx * 24 + 12
-            prev_noon_idx = (day_idx - 1) * 24 + 12 if day_idx > 0 else None
-            
-            pressure_noon = pressures[noon_hour_idx] if noon_hour_idx < len(pressures) else None
-            pressure_prev = pressures[prev_noon_idx] if prev_noon_idx and prev_noon_idx < len(pressures) else None
-            
-            # Calculate pressure change from previous day
-            pressure_change = None
-            if pressure_noon is not None and pressure_prev is not None:
-                pressure_change = round(pressure_noon - pressure_prev, 1)
-            
-            # Average humidity for the day (noon +/- 6 hours)
-            day_start_hour = day_idx * 24
-            day_humidities = humidities[day_start_hour:day_start_hour + 24]
-            avg_humidity = sum(day_humidities) / len(day_humidities) if day_humidities else None
-            
-            # Get precipitation description
-            precip_mm = daily.get("precipitation_sum", [0])[day_idx] or 0
-            precip_hours = daily.get("precipitation_hours", [0])[day_idx] or 0
-            
-            if precip_mm > 10:
-                description = "Heavy rain"
-            elif precip_mm > 2:
-                description = "Rain"
-            elif precip_mm > 0:
-                description = "Light rain"
-            elif precip_hours > 0:
-                description = "Drizzle"
-            else:
-                description = "Dry"
-            
-            return WeatherData(
-                temp_high_c=daily.get("temperature_2m_max", [None])[day_idx],
-                temp_low_c=daily.get("temperature_2m_min", [None])[day_idx],
-                temp_avg_c=daily.get("temperature_2m_mean", [None])[day_idx],
-                pressure_hpa=pressure_noon,
-                pressure_change_hpa=pressure_change,
-                humidity_percent=round(avg_humidity) if avg_humidity else None,
-                precipitation_mm=precip_mm,
-                wind_speed_kmh=daily.get("wind_speed_10m_max", [None])[day_idx],
-                description=description,
-                location=f"{lat:.2f}, {lon:.2f}",
-                fetched_at=datetime.now(),
-            )
-            
         except httpx.HTTPError as e:
-            print(f"Weather API error: {e}")
-            return None
-        except (KeyError, IndexError, TypeError) as e:
-            print(f"Weather data parsing error: {e}")
-            return None
+            logger.warning("Weather API error: %s", e)
+            return {}
+        
+        return self._parse_range(data, start, end, lat, lon)
+    
+    async def get_weather_for_dates_async(
+        self,
+        requests: list[tuple[date, float, float]],
+        concurrency: int = 10,
+    ) -> list[Optional[WeatherData]]:
+        """
+        Fetch weather for (date, lat, lon) triples concurrently.
+        
+        For days that can't share one range request, e.g. a trip with a
+        different location each day. Results are in request order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_one(target_date: date, lat: float, lon: float) -> Optional[WeatherData]:
+            async with semaphore:
+                try:
+                    response = await self._aget(
+                        self.BASE_URL,
+                        params=self._range_params(target_date, target_date, lat, lon),
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError as e:
+                    logger.warning("Weather API error: %s", e)
+                    return None
+            days = self._parse_range(response.json(), target_date, target_date, lat, lon)
+            return days.get(target_date)
+        
+        return list(await asyncio.gather(*(fetch_one(*r) for r in requests)))
+    
+    @staticmethod
+    def _range_params(start: date, end: date, lat: float, lon: float) -> dict:
+        return {
+            "latitude": lat,
+            "longitude": lon,
+            "daily": [
+                "temperature_2m_max",
+                "temperature_2m_min",
+                "temperature_2m_mean",
+                "precipitation_sum",
+                "precipitation_hours",
+                "wind_speed_10m_max",
+            ],
+            "hourly": ["surface_pressure", "relative_humidity_2m"],
+            # Include the previous day to calculate pressure change
+            "start_date": (start - timedelta(days=1)).isoformat(),
+            "end_date": end.isoformat(),
+            "timezone": "auto",
+        }
+    
+    def _parse_range(
+        self, data: dict, start: date, end: date, lat: float, lon: float
+    ) -> dict[date, WeatherData]:
+        """Build a WeatherData per day in [start, end] from an Open-Meteo response."""
+        daily = data.get("daily", {})
+        hourly = data.get("hourly", {})
+        
+        results = {}
+        for day_idx, day in enumerate(daily.get("time", [])):
+            target_date = date.fromisoformat(day)
+            if not start <= target_date <= end:
+                continue
+            try:
+                results[target_date] = self._parse_day(daily, hourly, day_idx, lat, lon)
+            except (KeyError, IndexError, TypeError) as e:
+                logger.warning("Weather data parsing error for %s: %s", day, e)
+        return results
+    
+    def _parse_day(
+        self, daily: dict, hourly: dict, day_idx: int, lat: float, lon: float
+    ) -> WeatherData:
+        """Build the WeatherData for one day of an Open-Meteo response."""
+        # Get noon pressure for consistent comparison (index 12 for noon hour)
+        # Each day has 24 hours, so target day's noon is at index: day_idx * 24 + 12
+        pressures = hourly.get("surface_pressure", [])
+        humidities = hourly.get("relative_humidity_2m", [])
+        
+        noon_hour_idx = day_idx * 24 + 12
+        prev_noon_idx = (day_idx - 1) * 24 + 12 if day_idx > 0 else None
+        
+        pressure_noon = pressures[noon_hour_idx] if noon_hour_idx < len(pressures) else None
+        pressure_prev = pressures[prev_noon_idx] if prev_noon_idx and prev_noon_idx < len(pressures) else None
+        
+        # Calculate pressure change from previous day
+        pressure_change = None
+        if pressure_noon is not None and pressure_prev is not None:
+            pressure_change = round(pressure_noon - pressure_prev, 1)
+        
+        # Average humidity for the day (noon +/- 6 hours)
+        day_start_hour = day_idx * 24
+        day_humidities = [
+            h for h in humidities[day_start_hour:day_start_hour + 24] if h is not None
+        ]
+        avg_humidity = sum(day_humidities) / len(day_humidities) if day_humidities else None
+        
+        # Get precipitation description
+        precip_mm = daily.get("precipitation_sum", [0])[day_idx] or 0
+        precip_hours = daily.get("precipitation_hours", [0])[day_idx] or 0
+        
+        description = _precip_description(precip_mm, precip_hours)
+        
+        return WeatherData(
+            temp_high_c=daily.get("temperature_2m_max", [None])[day_idx],
+            temp_low_c=daily.get("temperature_2m_min", [None])[day_idx],
+            temp_avg_c=daily.get("temperature_2m_mean", [None])[day_idx],
+            pressure_hpa=pressure_noon,
+            pressure_change_hpa=pressure_change,
+            humidity_percent=round(avg_humidity) if avg_humidity is not None else None,
+            precipitation_mm=precip_mm,
+            wind_speed_kmh=daily.get("wind_speed_10m_max", [None])[day_idx],
+            description=description,
+            location=f"{lat:.2f}, {lon:.2f}",
+            fetched_at=datetime.now(),
+        )
     
     def get_current_weather(
         self,
@@ -155,15 +226,3 @@ class WeatherClient:
     ) -> Optional[WeatherData]:
         """Fetch today's weather summary."""
         return self.get_weather_for_date(date.today(), lat, lon)
-    
-    def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client:
-            self._client.close()
-            self._client = None
-    
-    def __enter__(self) -> "WeatherClient":
-        return self
-    
-    def __exit__(self, *args) -> None:
-        self.close()
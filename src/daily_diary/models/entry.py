@@ -48,35 +48,38 @@ class DiaryEntry(BaseModel):
     # Entry completeness
     is_complete: bool = False
     
-    def add_symptom(self, symptom: Symptom) -> None:
+    # The add_* helpers accept `now` so a batch of additions can share one
+    # updated_at timestamp
+    
+    def add_symptom(self, symptom: Symptom, *, now: Optional[datetime] = None) -> None:
         """Add a symptom to this entry."""
         self.symptoms.append(symptom)
-        self.updated_at = datetime.now()
+        self.updated_at = now or datetime.now()
     
-    def add_incident(self, incident: Incident) -> None:
+    def add_incident(self, incident: Incident, *, now: Optional[datetime] = None) -> None:
         """Add an incident to this entry."""
         self.incidents.append(incident)
-        self.updated_at = datetime.now()
+        self.updated_at = now or datetime.now()
     
-    def add_meal(self, meal: Meal) -> None:
+    def add_meal(self, meal: Meal, *, now: Optional[datetime] = None) -> None:
         """Add a meal to this entry."""
         self.meals.append(meal)
-        self.updated_at = datetime.now()
+        self.updated_at = now or datetime.now()
     
-    def add_medication(self, medication: Medication) -> None:
+    def add_medication(self, medication: Medication, *, now: Optional[datetime] = None) -> None:
         """Add a medication to this entry."""
         self.medications.append(medication)
-        self.updated_at = datetime.now()
+        self.updated_at = now or datetime.now()
     
-    def add_supplement(self, supplement: Supplement) -> None:
+    def add_supplement(self, supplement: Supplement, *, now: Optional[datetime] = None) -> None:
         """Add a supplement to this entry."""
         self.supplements.append(supplement)
-        self.updated_at = datetime.now()
+        self.updated_at = now or datetime.now()
     
-    def mark_complete(self) -> None:
+    def mark_complete(self, *, now: Optional[datetime] = None) -> None:
         """Mark the entry as complete."""
         self.is_complete = True
-        self.updated_at = datetime.now()
+        self.updated_at = now or datetime.now()
     
     @property
     def has_symptoms(self) -> bool:
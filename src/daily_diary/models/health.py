@@ -2,11 +2,18 @@
 
 from datetime import datetime, time
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 from pydantic import BaseModel, Field
 
 
+@lru_cache(maxsize=128)
+def _humanize(value: str) -> str:
+    """Display form of an enum value, e.g. "neck_left" -> "Neck Left"."""
+    return value.replace("_", " ").title()
+
+
 class Severity(int, Enum):
     """Pain/symptom severity scale (0-10)."""
     NONE = 0
@@ -87,7 +94,7 @@ class Symptom(BaseModel):
         """Human-readable symptom type."""
         if self.type == SymptomType.OTHER and self.custom_type:
             return self.custom_type
-        return self.type.value.replace("_", " ").title()
+        return _humanize(self.type.value)
     
     @property
     def display_location(self) -> str | None:
@@ -96,7 +103,7 @@ class Symptom(BaseModel):
             return None
         if self.location == BodyLocation.OTHER and self.custom_location:
             return self.custom_location
-        return self.location.value.replace("_", " ").title()
+        return _humanize(self.location.value)
 
 
 class IncidentType(str, Enum):
@@ -128,7 +135,7 @@ class Incident(BaseModel):
         """Human-readable incident type."""
         if self.type == IncidentType.OTHER and self.custom_type:
             return self.custom_type
-        return self.type.value.title()
+        return _humanize(self.type.value)
 
 
 class MealType(str, Enum):
@@ -1,23 +1,34 @@
 """Business logic services."""
 
-from .advisor import HealthAdvisor
-from .analysis import AnalysisService
-from .database import AnalyticsDB
-from .diary_parser import DiaryParser
-from .nutrition import NutritionEstimator
-from .prompting import DiaryPrompter
-from .routines import RoutinesService
-from .storage import DiaryStorage
-from .transcription import TranscriptionService
+from importlib import import_module
 
-__all__ = [
-    "DiaryStorage",
-    "DiaryPrompter", 
-    "TranscriptionService", 
-    "AnalysisService", 
-    "AnalyticsDB",
-    "NutritionEstimator",
-    "HealthAdvisor",
-    "DiaryParser",
-    "RoutinesService",
-]
+# Exported name -> submodule. Resolved on first access (PEP 562) so that
+# importing one service (e.g. storage) doesn't pull in pandas/scipy,
+# the LLM SDKs or the transcription backend.
+_EXPORTS = {
+    "DiaryStorage": ".storage",
+    "DiaryPrompter": ".prompting",
+    "TranscriptionService": ".transcription",
+    "AnalysisService": ".analysis",
+    "AnalyticsDB": ".database",
+    "NutritionEstimator": ".nutrition",
+    "HealthAdvisor": ".advisor",
+    "DiaryParser": ".diary_parser",
+    "RoutinesService": ".routines",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -1,13 +1,44 @@
 """AI Health Advisor - Doctor's appointment simulation."""
 
+import asyncio
 import json
+import logging
+import re
+import uuid
+from collections import deque
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from ..models.entry import DiaryEntry
 from ..services.database import AnalyticsDB
 from ..services.storage import DiaryStorage
-from ..utils.config import get_settings
+from ..utils.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+# Formatted health context per `days`, reused across sessions until the data changes
+_context_cache: dict[int, tuple[tuple, str]] = {}
+
+# Body of the first markdown code block, tolerating a missing closing fence
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+
+
+def _data_fingerprint(settings: Settings) -> tuple:
+    """
+    Cheap change marker for everything the health context reads.
+    
+    Every write lands in the TinyDB diary file or the SQLite analytics
+    database (WAL mode, so its -wal file too), so their mtimes/sizes plus
+    today's date (the window slides) identify a context build.
+    """
+    marker = [date.today()]
+    for name in ("diary.json", "analytics.db", "analytics.db-wal"):
+        try:
+            stat = (settings.data_dir / name).stat()
+            marker.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            marker.append(None)
+    return tuple(marker)
 
 
 class HealthAdvisor:
@@ -50,6 +81,18 @@ When discussing their data:
 
 Start by greeting them warmly and asking what brings them in today."""
 
+    # Bounds on the conversation resent with every turn (the saved transcript is kept whole)
+    MAX_HISTORY_MESSAGES = 12
+    MAX_HISTORY_CHARS = 16000
+    MAX_RECAP_CHARS = 2000
+    
+    # Appended to a streamed reply that failed or was abandoned part-way
+    TRUNCATED_MARKER = "[response interrupted]"
+    
+    UNAVAILABLE_MESSAGE = (
+        "I'm sorry, but I'm unable to respond right now. Please check your API configuration."
+    )
+
     def __init__(self):
         self.settings = get_settings()
         self._anthropic_client = None
@@ -69,7 +112,9 @@ Start by greeting them warmly and asking what brings them in today."""
         if self._anthropic_client is None and self.settings.anthropic_api_key:
             try:
                 import anthropic
-                self._anthropic_client = anthropic.Anthropic(api_key=self.settings.anthropic_api_key)
+                self._anthropic_client = anthropic.AsyncAnthropic(
+                    api_key=self.settings.anthropic_api_key
+                )
             except ImportError:
                 pass
         return self._anthropic_client
@@ -78,8 +123,8 @@ Start by greeting them warmly and asking what brings them in today."""
     def openai_client(self):
         if self._openai_client is None and self.settings.openai_api_key:
             try:
-                from openai import OpenAI
-                self._openai_client = OpenAI(api_key=self.settings.openai_api_key)
+                from openai import AsyncOpenAI
+                self._openai_client = AsyncOpenAI(api_key=self.settings.openai_api_key)
             except ImportError:
                 pass
         return self._openai_client
@@ -100,8 +145,20 @@ Start by greeting them warmly and asking what brings them in today."""
         """
         Gather health data from the diary to provide context to the AI.
         
-        Returns a formatted string summarizing recent health data.
+        Returns a formatted string summarizing recent health data. The result
+        is cached in-process until the diary or analytics database changes.
         """
+        fingerprint = _data_fingerprint(self.settings)
+        cached = _context_cache.get(days)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        context = self._build_health_context(days)
+        _context_cache[days] = (fingerprint, context)
+        return context
+    
+    def _build_health_context(self, days: int) -> str:
+        """Build the health context string from storage and the analytics DB."""
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         start_str = start_date.isoformat()
@@ -111,7 +168,6 @@ Start by greeting them warmly and asking what brings them in today."""
         
         # Get user profile first
         try:
-            from .database import AnalyticsDB
             with AnalyticsDB() as db:
                 profile_summary = db.get_profile_summary_for_advisor()
                 if profile_summary:
@@ -135,131 +191,110 @@ Start by greeting them warmly and asking what brings them in today."""
         context_parts.append(f"Period: {start_date} to {end_date}")
         context_parts.append(f"Total entries: {len(entries)}\n")
         
-        # Symptoms summary
-        all_symptoms = []
+        # Single pass over entries; each section keeps only the tail it reports
+        symptoms = deque(maxlen=20)
+        sleep_nights = deque(maxlen=14)
+        weather_days = deque(maxlen=14)
+        trigger_meals = deque(maxlen=10)
+        medications = deque(maxlen=15)
+        wellbeing_days = deque(maxlen=14)
+        notes = deque(maxlen=5)
+        symptom_count = 0
+        medication_count = 0
         for entry in entries:
-            for symptom in entry.symptoms:
-                all_symptoms.append({
-                    "date": entry.entry_date.isoformat(),
-                    "type": symptom.display_type,
-                    "severity": symptom.severity.value,
-                    "location": symptom.display_location,
-                    "notes": symptom.notes,
-                })
-        
-        if all_symptoms:
+            date_iso = entry.entry_date.isoformat()
+            integrations = entry.integrations
+            
+            symptom_count += len(entry.symptoms)
+            medication_count += len(entry.medications)
+            symptoms.extend((date_iso, symptom) for symptom in entry.symptoms)
+            if integrations.sleep:
+                sleep_nights.append((date_iso, integrations.sleep))
+            if integrations.weather:
+                weather_days.append((date_iso, integrations.weather))
+            trigger_meals.extend(
+                (date_iso, meal) for meal in entry.meals
+                if meal.contains_alcohol or meal.contains_caffeine or meal.contains_common_triggers
+            )
+            medications.extend((date_iso, med) for med in entry.medications)
+            if entry.overall_wellbeing:
+                wellbeing_days.append((date_iso, entry))
+            if entry.general_notes:
+                notes.append(f"  {date_iso}: {entry.general_notes[:200]}...")
+        
+        # Symptoms summary
+        if symptoms:
             context_parts.append("--- SYMPTOMS ---")
-            for s in all_symptoms[-20:]:  # Last 20 symptoms
-                context_parts.append(
-                    f"  {s['date']}: {s['type']} (severity {s['severity']}/10) "
-                    f"at {s['location']}{' - ' + s['notes'] if s['notes'] else ''}"
-                )
-            if len(all_symptoms) > 20:
-                context_parts.append(f"  ... and {len(all_symptoms) - 20} more symptoms")
+            for day, s in symptoms:  # Last 20 symptoms
+                parts = [
+                    f"  {day}: {s.display_type} (severity {s.severity.value}/10) "
+                    f"at {s.display_location}"
+                ]
+                if s.notes:
+                    parts.append(s.notes)
+                context_parts.append(" - ".join(parts))
+            if symptom_count > 20:
+                context_parts.append(f"  ... and {symptom_count - 20} more symptoms")
             context_parts.append("")
         
         # Sleep data
-        sleep_data = []
-        for entry in entries:
-            if entry.integrations.sleep:
-                s = entry.integrations.sleep
-                sleep_data.append({
-                    "date": entry.entry_date.isoformat(),
-                    "score": s.sleep_score,
-                    "duration_hrs": round(s.total_sleep_minutes / 60, 1) if s.total_sleep_minutes else None,
-                    "hrv": s.hrv_average,
-                    "deep_pct": round(s.deep_sleep_minutes / s.total_sleep_minutes * 100) if s.total_sleep_minutes and s.deep_sleep_minutes else None,
-                })
-        
-        if sleep_data:
+        if sleep_nights:
             context_parts.append("--- SLEEP (Last 14 nights) ---")
-            for s in sleep_data[-14:]:
-                parts = [f"  {s['date']}: Score {s['score']}"]
-                if s['duration_hrs']:
-                    parts.append(f"{s['duration_hrs']}h")
-                if s['hrv']:
-                    parts.append(f"HRV {s['hrv']:.0f}")
-                if s['deep_pct']:
-                    parts.append(f"Deep {s['deep_pct']}%")
+            for day, s in sleep_nights:
+                parts = [f"  {day}: Score {s.sleep_score}"]
+                total = s.total_sleep_minutes
+                duration_hrs = round(total / 60, 1) if total else None
+                deep = s.deep_sleep_minutes
+                deep_pct = round(deep / total * 100) if total and deep else None
+                if duration_hrs:
+                    parts.append(f"{duration_hrs}h")
+                if s.hrv_average:
+                    parts.append(f"HRV {s.hrv_average:.0f}")
+                if deep_pct:
+                    parts.append(f"Deep {deep_pct}%")
                 context_parts.append(", ".join(parts))
             context_parts.append("")
         
         # Weather data (especially pressure)
-        weather_data = []
-        for entry in entries:
-            if entry.integrations.weather:
-                w = entry.integrations.weather
-                weather_data.append({
-                    "date": entry.entry_date.isoformat(),
-                    "pressure": w.pressure_hpa,
-                    "pressure_change": getattr(w, 'pressure_change_hpa', None),
-                    "temp": w.temp_avg_c,
-                    "description": w.description,
-                })
-        
-        if weather_data:
+        if weather_days:
             context_parts.append("--- WEATHER/PRESSURE (Last 14 days) ---")
-            for w in weather_data[-14:]:
-                pressure_str = f"{w['pressure']} hPa"
-                if w.get('pressure_change'):
-                    change = w['pressure_change']
-                    if change > 0:
-                        pressure_str += f" (↑{change:.1f})"
-                    elif change < 0:
-                        pressure_str += f" (↓{abs(change):.1f})"
+            for day, w in weather_days:
+                pressure = [f"{w.pressure_hpa} hPa"]
+                change = w.pressure_change_hpa
+                if change and change > 0:
+                    pressure.append(f"(↑{change:.1f})")
+                elif change and change < 0:
+                    pressure.append(f"(↓{abs(change):.1f})")
                 context_parts.append(
-                    f"  {w['date']}: {pressure_str}, {w['temp']:.0f}°C, {w['description']}"
+                    f"  {day}: {' '.join(pressure)}, {w.temp_avg_c:.0f}°C, {w.description}"
                 )
             context_parts.append("")
         
         # Note: Activities are now loaded from SQLite below (includes both Strava and manual)
         
         # Meals with potential triggers
-        trigger_meals = []
-        for entry in entries:
-            for meal in entry.meals:
-                if meal.contains_alcohol or meal.contains_caffeine or meal.contains_common_triggers:
-                    trigger_meals.append({
-                        "date": entry.entry_date.isoformat(),
-                        "meal": meal.description[:50],
-                        "alcohol": meal.alcohol_units if meal.contains_alcohol else 0,
-                        "caffeine": meal.contains_caffeine,
-                        "triggers": meal.contains_common_triggers,
-                    })
-        
         if trigger_meals:
             context_parts.append("--- POTENTIAL DIETARY TRIGGERS ---")
-            for m in trigger_meals[-10:]:
+            for day, m in trigger_meals:
                 flags = []
-                if m['alcohol']:
-                    flags.append(f"{m['alcohol']} alcohol units")
-                if m['caffeine']:
+                if m.contains_alcohol and m.alcohol_units:
+                    flags.append(f"{m.alcohol_units} alcohol units")
+                if m.contains_caffeine:
                     flags.append("caffeine")
-                if m['triggers']:
-                    flags.append(f"triggers: {', '.join(m['triggers'])}")
-                context_parts.append(f"  {m['date']}: {m['meal']} ({', '.join(flags)})")
+                if m.contains_common_triggers:
+                    flags.append(f"triggers: {', '.join(m.contains_common_triggers)}")
+                context_parts.append(f"  {day}: {m.description[:50]} ({', '.join(flags)})")
             context_parts.append("")
         
         # Medications taken
-        all_medications = []
-        for entry in entries:
-            for med in entry.medications:
-                all_medications.append({
-                    "date": entry.entry_date.isoformat(),
-                    "name": med.name,
-                    "dosage": med.dosage,
-                    "reason": med.reason,
-                    "time": str(med.time_taken) if med.time_taken else None,
-                })
-        
-        if all_medications:
+        if medications:
             context_parts.append("--- MEDICATIONS TAKEN ---")
-            for m in all_medications[-15:]:
-                time_str = f" at {m['time']}" if m['time'] else ""
-                reason_str = f" for {m['reason']}" if m['reason'] else ""
-                context_parts.append(f"  {m['date']}: {m['name']} {m['dosage'] or ''}{time_str}{reason_str}")
-            if len(all_medications) > 15:
-                context_parts.append(f"  ... and {len(all_medications) - 15} more medications")
+            for day, m in medications:
+                time_str = f" at {m.time_taken}" if m.time_taken else ""
+                reason_str = f" for {m.reason}" if m.reason else ""
+                context_parts.append(f"  {day}: {m.name} {m.dosage or ''}{time_str}{reason_str}")
+            if medication_count > 15:
+                context_parts.append(f"  ... and {medication_count - 15} more medications")
             context_parts.append("")
         
         # Medication effectiveness analysis
@@ -284,44 +319,27 @@ Start by greeting them warmly and asking what brings them in today."""
             pass  # Analysis not available
         
         # Wellbeing scores
-        wellbeing_data = []
-        for entry in entries:
-            if entry.overall_wellbeing:
-                wellbeing_data.append({
-                    "date": entry.entry_date.isoformat(),
-                    "wellbeing": entry.overall_wellbeing,
-                    "energy": entry.energy_level,
-                    "stress": entry.stress_level,
-                    "mood": entry.mood,
-                })
-        
-        if wellbeing_data:
+        if wellbeing_days:
             context_parts.append("--- WELLBEING SCORES (Last 14 days) ---")
-            for w in wellbeing_data[-14:]:
-                parts = [f"  {w['date']}: Wellbeing {w['wellbeing']}/10"]
-                if w['energy']:
-                    parts.append(f"Energy {w['energy']}/10")
-                if w['stress']:
-                    parts.append(f"Stress {w['stress']}/10")
-                if w['mood']:
-                    parts.append(f"Mood: {w['mood']}")
+            for day, e in wellbeing_days:
+                parts = [f"  {day}: Wellbeing {e.overall_wellbeing}/10"]
+                if e.energy_level:
+                    parts.append(f"Energy {e.energy_level}/10")
+                if e.stress_level:
+                    parts.append(f"Stress {e.stress_level}/10")
+                if e.mood:
+                    parts.append(f"Mood: {e.mood}")
                 context_parts.append(", ".join(parts))
             context_parts.append("")
         
         # Notes
-        notes = []
-        for entry in entries:
-            if entry.general_notes:
-                notes.append(f"  {entry.entry_date}: {entry.general_notes[:200]}...")
-        
         if notes:
             context_parts.append("--- RECENT NOTES ---")
-            context_parts.extend(notes[-5:])
+            context_parts.extend(notes)
             context_parts.append("")
         
         # SQLite data: meals, vitals, and quick log factors
         try:
-            from .database import AnalyticsDB
             import pandas as pd
             
             with AnalyticsDB() as db:
@@ -470,22 +488,20 @@ Start by greeting them warmly and asking what brings them in today."""
         
         return "\n".join(context_parts)
     
-    def start_consultation(self, days: int = 30, session_id: str = None) -> tuple[str, str]:
+    async def start_consultation(self, days: int = 30, session_id: str = None) -> tuple[str, str]:
         """
         Start a new consultation session.
         
         Returns:
             Tuple of (greeting message, provider used)
         """
-        import uuid
-        
         self._conversation_history = []
         self._session_id = session_id or str(uuid.uuid4())
         self._started_at = datetime.now()
         self._days_reviewed = days
         
-        # Get health context and store it for the session
-        self._health_context = self.get_health_context(days)
+        # Get health context and store it for the session (blocking DB reads)
+        self._health_context = await asyncio.to_thread(self.get_health_context, days)
         
         # Build and store system prompt with context
         self._system_prompt_with_context = f"{self.SYSTEM_PROMPT}\n\n{self._health_context}"
@@ -494,7 +510,7 @@ Start by greeting them warmly and asking what brings them in today."""
         initial_prompt = "Please greet me and ask what brings me in today. Briefly mention that you've reviewed my recent health data."
         
         # Get initial greeting
-        response, provider = self._get_response(
+        response, provider = await self._get_response(
             self._system_prompt_with_context,
             initial_prompt,
             is_first_message=True
@@ -515,7 +531,7 @@ Start by greeting them warmly and asking what brings them in today."""
         
         return response, provider
     
-    def send_message(self, user_message: str) -> tuple[str, str]:
+    async def send_message(self, user_message: str) -> tuple[str, str]:
         """
         Send a message and get a response.
         
@@ -536,7 +552,7 @@ Start by greeting them warmly and asking what brings them in today."""
         system_prompt = self._system_prompt_with_context or self.SYSTEM_PROMPT
         
         # Get response
-        response, provider = self._get_response(system_prompt, user_message)
+        response, provider = await self._get_response(system_prompt, user_message)
         
         # Add assistant response to history
         self._conversation_history.append({
@@ -546,7 +562,57 @@ Start by greeting them warmly and asking what brings them in today."""
         
         return response, provider
     
-    def _get_response(
+    async def send_message_stream(self, user_message: str) -> AsyncIterator[str]:
+        """
+        Send a message and yield the response text as it is generated.
+        
+        Falls back to OpenAI only if Claude fails before producing any text.
+        The reply is added to the history however the stream ends; if a provider
+        fails mid-reply or the consumer stops early (client disconnect), it is
+        saved with TRUNCATED_MARKER so the transcript shows it was cut off.
+        """
+        self._conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+        system_prompt = self._system_prompt_with_context or self.SYSTEM_PROMPT
+        
+        streams = []
+        if self.has_claude:
+            streams.append(self._stream_claude)
+        if self.has_openai:
+            streams.append(self._stream_openai)
+        
+        chunks: list[str] = []
+        complete = False
+        try:
+            for stream in streams:
+                try:
+                    async for text in stream(system_prompt, user_message):
+                        chunks.append(text)
+                        yield text
+                except Exception:
+                    logger.exception("Health advisor stream from %s failed", stream.__name__)
+                else:
+                    complete = bool(chunks)
+                if chunks:
+                    break
+            
+            if not chunks:
+                chunks.append(self.UNAVAILABLE_MESSAGE)
+                complete = True
+                yield self.UNAVAILABLE_MESSAGE
+        finally:
+            reply = "".join(chunks)
+            if not complete:
+                logger.warning("Health advisor reply truncated after %d characters", len(reply))
+                reply = f"{reply} {self.TRUNCATED_MARKER}".lstrip()
+            self._conversation_history.append({
+                "role": "assistant",
+                "content": reply
+            })
+    
+    async def _get_response(
         self, 
         system_prompt: str, 
         user_message: str,
@@ -556,19 +622,70 @@ Start by greeting them warmly and asking what brings them in today."""
         
         # Try Claude first
         if self.has_claude:
-            response = self._try_claude(system_prompt, user_message, is_first_message)
+            response = await self._try_claude(system_prompt, user_message, is_first_message)
             if response:
                 return response, "claude"
         
         # Fall back to OpenAI
         if self.has_openai:
-            response = self._try_openai(system_prompt, user_message, is_first_message)
+            response = await self._try_openai(system_prompt, user_message, is_first_message)
             if response:
                 return response, "openai"
         
-        return "I'm sorry, but I'm unable to respond right now. Please check your API configuration.", "none"
+        return self.UNAVAILABLE_MESSAGE, "none"
+    
+    def _claude_request(
+        self,
+        system_prompt: str,
+        user_message: str,
+        is_first_message: bool = False
+    ) -> dict:
+        """Keyword arguments for a Claude messages call."""
+        # Build messages
+        if is_first_message:
+            messages = [{"role": "user", "content": user_message}]
+        else:
+            messages = self._prompt_history()
+            # Add the new user message
+            messages.append({"role": "user", "content": user_message})
+        
+        return dict(
+            model="claude-opus-4-8",
+            max_tokens=1500,
+            # Cache the system prompt + health context prefix across the consultation's turns
+            system=[{
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }],
+            messages=messages,
+        )
     
-    def _try_claude(
+    def _openai_request(
+        self,
+        system_prompt: str,
+        user_message: str,
+        is_first_message: bool = False
+    ) -> dict:
+        """Keyword arguments for an OpenAI chat completions call."""
+        # Build messages
+        messages = [{"role": "system", "content": system_prompt}]
+        
+        if is_first_message:
+            messages.append({"role": "user", "content": user_message})
+        else:
+            messages.extend(self._prompt_history())
+            # Add the new user message
+            messages.append({"role": "user", "content": user_message})
+        
+        return dict(
+            model="gpt-4o",
+            messages=messages,
+            max_tokens=1500,
+            temperature=0.7,
+        )
+    
+    async def _try_claude(
         self, 
         system_prompt: str, 
         user_message: str,
@@ -576,24 +693,11 @@ Start by greeting them warmly and asking what brings them in today."""
     ) -> Optional[str]:
         """Try to get response from Claude."""
         try:
-            import anthropic
-            
             if not self.anthropic_client:
                 return None
             
-            # Build messages
-            if is_first_message:
-                messages = [{"role": "user", "content": user_message}]
-            else:
-                messages = self._conversation_history.copy()
-                # Add the new user message
-                messages.append({"role": "user", "content": user_message})
-            
-            response = self.anthropic_client.messages.create(
-                model="claude-opus-4-8",
-                max_tokens=1500,
-                system=system_prompt,
-                messages=messages,
+            response = await self.anthropic_client.messages.create(
+                **self._claude_request(system_prompt, user_message, is_first_message)
             )
             
             return response.content[0].text
@@ -602,7 +706,7 @@ Start by greeting them warmly and asking what brings them in today."""
             print(f"Claude health advisor error: {e}")
             return None
     
-    def _try_openai(
+    async def _try_openai(
         self, 
         system_prompt: str, 
         user_message: str,
@@ -610,26 +714,11 @@ Start by greeting them warmly and asking what brings them in today."""
     ) -> Optional[str]:
         """Try to get response from OpenAI."""
         try:
-            from openai import OpenAI
-            
             if not self.openai_client:
                 return None
             
-            # Build messages
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            if is_first_message:
-                messages.append({"role": "user", "content": user_message})
-            else:
-                messages.extend(self._conversation_history)
-                # Add the new user message
-                messages.append({"role": "user", "content": user_message})
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages,
-                max_tokens=1500,
-                temperature=0.7,
+            response = await self.openai_client.chat.completions.create(
+                **self._openai_request(system_prompt, user_message, is_first_message)
             )
             
             return response.choices[0].message.content
@@ -638,6 +727,61 @@ Start by greeting them warmly and asking what brings them in today."""
             print(f"OpenAI health advisor error: {e}")
             return None
     
+    async def _stream_claude(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        """Yield Claude's response text as it is generated."""
+        if not self.anthropic_client:
+            return
+        
+        request = self._claude_request(system_prompt, user_message)
+        async with self.anthropic_client.messages.stream(**request) as stream:
+            async for text in stream.text_stream:
+                yield text
+    
+    async def _stream_openai(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        """Yield OpenAI's response text as it is generated."""
+        if not self.openai_client:
+            return
+        
+        request = self._openai_request(system_prompt, user_message)
+        stream = await self.openai_client.chat.completions.create(**request, stream=True)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def _prompt_history(self) -> list[dict]:
+        """
+        Conversation turns to send to the provider.
+        
+        The most recent messages are kept verbatim, bounded by count and total
+        size. Older ones are folded into a short recap on the first kept user turn,
+        or sent as the recap alone if the kept messages hold no user turn.
+        """
+        history = self._conversation_history
+        keep = min(len(history), self.MAX_HISTORY_MESSAGES)
+        while keep > 2 and sum(len(m["content"]) for m in history[-keep:]) > self.MAX_HISTORY_CHARS:
+            keep -= 2
+        
+        start = len(history) - keep
+        # The window must open with a user turn
+        while start < len(history) and history[start]["role"] != "user":
+            start += 1
+        if start == 0:
+            return list(history)
+        
+        recap = " | ".join(
+            f"{'Patient' if m['role'] == 'user' else 'Advisor'}: {m['content'][:150]}"
+            for m in history[:start]
+        )[:self.MAX_RECAP_CHARS]
+        recap_turn = f"[Earlier in this consultation: {recap}]"
+        if start == len(history):
+            return [{"role": "user", "content": recap_turn}]
+        
+        first = history[start]
+        return [
+            {"role": "user", "content": f"{recap_turn}\n\n{first['content']}"},
+            *history[start + 1:],
+        ]
+    
     def get_conversation_history(self) -> list[dict]:
         """Get the current conversation history."""
         return self._conversation_history.copy()
@@ -651,7 +795,7 @@ Start by greeting them warmly and asking what brings them in today."""
         self._started_at = None
         self._provider_used = None
     
-    def end_consultation(self) -> Optional[dict]:
+    async def end_consultation(self) -> Optional[dict]:
         """
         End the consultation and generate a summary.
         
@@ -662,13 +806,10 @@ Start by greeting them warmly and asking what brings them in today."""
             return None
         
         # Generate summary using AI
-        summary_data = self._generate_summary()
+        summary_data = await self._generate_summary()
         
         # Save to database
         try:
-            from .database import AnalyticsDB
-            import json
-            
             with AnalyticsDB() as db:
                 db.save_consultation(
                     consultation_id=self._session_id,
@@ -701,7 +842,7 @@ Start by greeting them warmly and asking what brings them in today."""
         
         return result
     
-    def _generate_summary(self) -> dict:
+    async def _generate_summary(self) -> dict:
         """Generate a structured summary of the consultation."""
         
         summary_prompt = """Based on our consultation conversation, please provide a structured summary in JSON format with these fields:
@@ -720,7 +861,7 @@ Return ONLY the JSON object, no other text. If a field doesn't apply, use null."
         print(f"[DEBUG] Generating summary with {len(self._conversation_history)} messages in history")
         
         # Add summary request to get response
-        response, _ = self._get_response(
+        response, _ = await self._get_response(
             self._system_prompt_with_context,
             summary_prompt,
         )
@@ -729,14 +870,9 @@ Return ONLY the JSON object, no other text. If a field doesn't apply, use null."
         
         # Parse JSON response
         try:
-            import json
-            
             # Handle potential markdown code blocks
-            text = response
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0]
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0]
+            match = _FENCE_RE.search(response)
+            text = match.group(1) if match else response
             
             result = json.loads(text.strip())
             print(f"[DEBUG] Summary parsed successfully")
@@ -5,7 +5,7 @@ from datetime import date, timedelta
 from typing import Optional
 
 import pandas as pd
-from scipy import stats
+from scipy import signal, stats
 
 from ..models.entry import DiaryEntry
 from ..models.health import SymptomType
@@ -550,22 +550,15 @@ class AnalysisService:
         ctl_decay = 1 - np.exp(-1/42)
         atl_decay = 1 - np.exp(-1/7)
         
-        ctl_values = []
-        atl_values = []
-        tsb_values = []
+        # Each load is the recurrence load += (stress - load) * decay from 0,
+        # i.e. a first-order IIR filter, run over the whole series in C
+        stress = df['daily_stress'].to_numpy(dtype=float)
+        ctl_series = signal.lfilter([ctl_decay], [1, ctl_decay - 1], stress)
+        atl_series = signal.lfilter([atl_decay], [1, atl_decay - 1], stress)
         
-        ctl = 0
-        atl = 0
-        
-        for _, row in df.iterrows():
-            stress = row['daily_stress']
-            ctl = ctl + (stress - ctl) * ctl_decay
-            atl = atl + (stress - atl) * atl_decay
-            tsb = ctl - atl
-            
-            ctl_values.append(round(ctl, 1))
-            atl_values.append(round(atl, 1))
-            tsb_values.append(round(tsb, 1))
+        ctl_values = [round(v, 1) for v in ctl_series.tolist()]
+        atl_values = [round(v, 1) for v in atl_series.tolist()]
+        tsb_values = [round(v, 1) for v in (ctl_series - atl_series).tolist()]
         
         # Only return the requested lookback period for display
         display_start =  60  # Skip warmup period
@@ -2,7 +2,9 @@
 
 from datetime import date, datetime, time, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
+import hashlib
+import re
 import sqlite3
 import json
 
@@ -415,6 +417,16 @@ class AnalyticsDB:
             )
         """)
         
+        # ===== NUTRITION CACHE TABLE =====
+        # LLM estimates keyed by normalized (description, meal_type) hash
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS nutrition_cache (
+                desc_hash TEXT PRIMARY KEY,
+                nutrition_json TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
         # ===== CONSULTATIONS TABLE =====
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS consultations (
@@ -472,14 +484,21 @@ class AnalyticsDB:
         
         # Create indexes
         self._create_indexes()
+        self._create_triggers()
         self.conn.commit()
     
     def _create_indexes(self) -> None:
         """Create indexes for performance."""
+        self._ensure_daily_summary_unique()
+        
         indexes = [
             "CREATE INDEX IF NOT EXISTS idx_sleep_date ON sleep(entry_date)",
             "CREATE INDEX IF NOT EXISTS idx_activities_date ON activities(entry_date)",
+            # Integration lookups (e.g. Strava resync) probe by external id
+            "CREATE INDEX IF NOT EXISTS idx_activities_external ON activities(external_id, source)",
             "CREATE INDEX IF NOT EXISTS idx_meals_date ON meals(entry_date)",
+            # Covering index so per-day meal totals are served from the index alone
+            "CREATE INDEX IF NOT EXISTS idx_meals_entry_date_cov ON meals(entry_date, calories, protein_g, carbs_g, fat_g, fiber_g)",
             "CREATE INDEX IF NOT EXISTS idx_symptoms_date ON symptoms(entry_date)",
             "CREATE INDEX IF NOT EXISTS idx_symptoms_type ON symptoms(symptom_type)",
             "CREATE INDEX IF NOT EXISTS idx_weather_date ON weather(entry_date)",
@@ -494,12 +513,180 @@ class AnalyticsDB:
             except Exception:
                 pass
     
+    def _create_triggers(self) -> None:
+        """
+        Keep daily_summary meal totals in step with the meals table.
+        
+        Each insert/update/delete on meals applies its delta to that day's
+        summary row, so the totals never need a full rebuild. Relies on the
+        unique entry_date index for the upsert target.
+        
+        The deltas only hold if the totals were right to begin with, so the
+        first time the triggers are installed on an existing database the
+        totals are rebuilt from the meals table.
+        """
+        first_install = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'meals_ai'"
+        ).fetchone() is None
+        
+        self.conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS meals_ai AFTER INSERT ON meals BEGIN
+                INSERT INTO daily_summary (
+                    entry_date, meal_count, total_calories, total_protein_g,
+                    total_carbs_g, total_fat_g, total_fiber_g
+                ) VALUES (
+                    NEW.entry_date, 1,
+                    COALESCE(NEW.calories, 0), COALESCE(NEW.protein_g, 0),
+                    COALESCE(NEW.carbs_g, 0), COALESCE(NEW.fat_g, 0),
+                    COALESCE(NEW.fiber_g, 0)
+                )
+                ON CONFLICT(entry_date) DO UPDATE SET
+                    meal_count = COALESCE(meal_count, 0) + 1,
+                    total_calories = COALESCE(total_calories, 0) + excluded.total_calories,
+                    total_protein_g = COALESCE(total_protein_g, 0) + excluded.total_protein_g,
+                    total_carbs_g = COALESCE(total_carbs_g, 0) + excluded.total_carbs_g,
+                    total_fat_g = COALESCE(total_fat_g, 0) + excluded.total_fat_g,
+                    total_fiber_g = COALESCE(total_fiber_g, 0) + excluded.total_fiber_g;
+            END;
+            
+            CREATE TRIGGER IF NOT EXISTS meals_ad AFTER DELETE ON meals BEGIN
+                UPDATE daily_summary SET
+                    meal_count = MAX(COALESCE(meal_count, 0) - 1, 0),
+                    total_calories = COALESCE(total_calories, 0) - COALESCE(OLD.calories, 0),
+                    total_protein_g = COALESCE(total_protein_g, 0) - COALESCE(OLD.protein_g, 0),
+                    total_carbs_g = COALESCE(total_carbs_g, 0) - COALESCE(OLD.carbs_g, 0),
+                    total_fat_g = COALESCE(total_fat_g, 0) - COALESCE(OLD.fat_g, 0),
+                    total_fiber_g = COALESCE(total_fiber_g, 0) - COALESCE(OLD.fiber_g, 0)
+                WHERE entry_date = OLD.entry_date;
+            END;
+            
+            -- An update is a delete from the old date plus an insert on the new one
+            CREATE TRIGGER IF NOT EXISTS meals_au
+            AFTER UPDATE OF entry_date, calories, protein_g, carbs_g, fat_g, fiber_g ON meals
+            BEGIN
+                UPDATE daily_summary SET
+                    meal_count = MAX(COALESCE(meal_count, 0) - 1, 0),
+                    total_calories = COALESCE(total_calories, 0) - COALESCE(OLD.calories, 0),
+                    total_protein_g = COALESCE(total_protein_g, 0) - COALESCE(OLD.protein_g, 0),
+                    total_carbs_g = COALESCE(total_carbs_g, 0) - COALESCE(OLD.carbs_g, 0),
+                    total_fat_g = COALESCE(total_fat_g, 0) - COALESCE(OLD.fat_g, 0),
+                    total_fiber_g = COALESCE(total_fiber_g, 0) - COALESCE(OLD.fiber_g, 0)
+                WHERE entry_date = OLD.entry_date;
+                
+                INSERT INTO daily_summary (
+                    entry_date, meal_count, total_calories, total_protein_g,
+                    total_carbs_g, total_fat_g, total_fiber_g
+                ) VALUES (
+                    NEW.entry_date, 1,
+                    COALESCE(NEW.calories, 0), COALESCE(NEW.protein_g, 0),
+                    COALESCE(NEW.carbs_g, 0), COALESCE(NEW.fat_g, 0),
+                    COALESCE(NEW.fiber_g, 0)
+                )
+                ON CONFLICT(entry_date) DO UPDATE SET
+                    meal_count = COALESCE(meal_count, 0) + 1,
+                    total_calories = COALESCE(total_calories, 0) + excluded.total_calories,
+                    total_protein_g = COALESCE(total_protein_g, 0) + excluded.total_protein_g,
+                    total_carbs_g = COALESCE(total_carbs_g, 0) + excluded.total_carbs_g,
+                    total_fat_g = COALESCE(total_fat_g, 0) + excluded.total_fat_g,
+                    total_fiber_g = COALESCE(total_fiber_g, 0) + excluded.total_fiber_g;
+            END;
+        """)
+        
+        if first_install:
+            self._rebuild_meal_totals()
+    
+    def _rebuild_meal_totals(self) -> None:
+        """
+        Recompute the trigger-maintained meal totals from the meals table.
+        
+        Only the columns the triggers own are touched; caffeine, alcohol and
+        water come from quick-log totals too. The caller commits.
+        """
+        self.conn.execute("""
+            INSERT INTO daily_summary (
+                entry_date, meal_count, total_calories, total_protein_g,
+                total_carbs_g, total_fat_g, total_fiber_g
+            )
+            SELECT
+                entry_date,
+                COUNT(*),
+                COALESCE(SUM(calories), 0),
+                COALESCE(SUM(protein_g), 0),
+                COALESCE(SUM(carbs_g), 0),
+                COALESCE(SUM(fat_g), 0),
+                COALESCE(SUM(fiber_g), 0)
+            FROM meals
+            WHERE true
+            GROUP BY entry_date
+            ON CONFLICT(entry_date) DO UPDATE SET
+                meal_count = excluded.meal_count,
+                total_calories = excluded.total_calories,
+                total_protein_g = excluded.total_protein_g,
+                total_carbs_g = excluded.total_carbs_g,
+                total_fat_g = excluded.total_fat_g,
+                total_fiber_g = excluded.total_fiber_g
+        """)
+        # Days without meal rows keep no stale totals
+        self.conn.execute("""
+            UPDATE daily_summary SET
+                meal_count = 0,
+                total_calories = 0,
+                total_protein_g = 0,
+                total_carbs_g = 0,
+                total_fat_g = 0,
+                total_fiber_g = 0
+            WHERE (COALESCE(meal_count, 0) != 0 OR COALESCE(total_calories, 0) != 0)
+              AND NOT EXISTS (SELECT 1 FROM meals WHERE meals.entry_date = daily_summary.entry_date)
+        """)
+    
+    def _ensure_daily_summary_unique(self) -> None:
+        """
+        Guarantee one daily_summary row per date.
+        
+        Databases created before entry_date was the primary key can hold
+        duplicate rows. Drop all but the newest copy of each date, then add a
+        unique index so upserts can target entry_date from then on.
+        """
+        for index in self.conn.execute("PRAGMA index_list(daily_summary)").fetchall():
+            if not index["unique"]:
+                continue
+            columns = self.conn.execute(f"PRAGMA index_info({index['name']!r})").fetchall()
+            if [c["name"] for c in columns] == ["entry_date"]:
+                return
+        
+        self.conn.execute("""
+            WITH d AS (
+                SELECT rowid AS rid,
+                       ROW_NUMBER() OVER (PARTITION BY entry_date ORDER BY rowid DESC) AS rn
+                FROM daily_summary
+            )
+            DELETE FROM daily_summary
+            WHERE rowid IN (SELECT rid FROM d WHERE rn > 1)
+        """)
+        self.conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_daily_summary_entry_date ON daily_summary(entry_date)"
+        )
+    
     def execute(self, sql: str, params: list = None) -> sqlite3.Cursor:
         """Execute SQL and return cursor."""
         return self.conn.execute(sql, params or [])
     
     def upsert_entry(self, entry: DiaryEntry) -> None:
         """Insert or update a diary entry across all relevant tables."""
+        self._write_entry(entry)
+        self.conn.commit()
+    
+    def upsert_entries(self, entries: Iterable[DiaryEntry]) -> int:
+        """Upsert many entries in a single transaction; returns the count."""
+        count = 0
+        with self.conn:
+            for entry in entries:
+                self._write_entry(entry)
+                count += 1
+        return count
+    
+    def _write_entry(self, entry: DiaryEntry) -> None:
+        """Write an entry's rows without committing."""
         import uuid
         from ..models.health import SymptomType
         
@@ -532,7 +719,13 @@ class AnalyticsDB:
         
         # ===== ACTIVITIES =====
         # Only delete Strava activities, preserve manual ones (boxing, weightlifting, etc.)
-        self.conn.execute("DELETE FROM activities WHERE entry_date = ? AND source != 'manual'", [entry_date])
+        # Descriptions only come from Strava's detail endpoint, which is skipped when the
+        # list summary suffices, so keep the stored one when the fresh copy has none
+        stored_descriptions = dict(self.conn.execute(
+            "DELETE FROM activities WHERE entry_date = ? AND source != 'manual' "
+            "RETURNING id, description",
+            [entry_date],
+        ).fetchall())
         for activity in entry.integrations.activities or []:
             activity_id = activity.activity_id or str(uuid.uuid4())
             self.conn.execute("""
@@ -546,7 +739,7 @@ class AnalyticsDB:
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, [
                 activity_id, entry_date, activity.activity_type, activity.name,
-                activity.description, 
+                activity.description or stored_descriptions.get(activity_id),
                 activity.start_time.isoformat() if activity.start_time else None,
                 activity.duration_minutes, activity.distance_km, activity.elevation_gain_m,
                 activity.average_speed_kmh, activity.max_speed_kmh,
@@ -642,7 +835,6 @@ class AnalyticsDB:
         
         # ===== DAILY SUMMARY =====
         self._update_daily_summary(entry)
-        self.conn.commit()
     
     def _update_daily_summary(self, entry: DiaryEntry) -> None:
         """Update the daily summary table with aggregated data."""
@@ -665,31 +857,56 @@ class AnalyticsDB:
             for s in entry.symptoms
         )
         
-        total_alcohol = sum(m.alcohol_units or 0 for m in entry.meals if m.contains_alcohol)
-        
         s = entry.integrations.sleep
         w = entry.integrations.weather
         
+        # Upsert so meal/hydration totals maintained elsewhere aren't wiped. Meal
+        # count and alcohol come from the meals table (triggers/sync_meal_totals),
+        # not from the entry JSON, so they are left out here.
         self.conn.execute("""
-            INSERT OR REPLACE INTO daily_summary (
+            INSERT INTO daily_summary (
                 entry_date,
                 overall_wellbeing, energy_level, stress_level, mood,
                 sleep_score, total_sleep_minutes, sleep_efficiency, hrv_average,
                 activity_count, total_activity_minutes, total_distance_km, total_elevation_m,
-                meal_count, total_alcohol_units,
                 symptom_count, worst_symptom_severity, has_headache, has_neuralgiaform,
                 incident_count,
                 temp_avg_c, pressure_hpa, humidity_percent,
                 morning_notes, evening_notes, general_notes,
                 is_complete, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(entry_date) DO UPDATE SET
+                overall_wellbeing = excluded.overall_wellbeing,
+                energy_level = excluded.energy_level,
+                stress_level = excluded.stress_level,
+                mood = excluded.mood,
+                sleep_score = excluded.sleep_score,
+                total_sleep_minutes = excluded.total_sleep_minutes,
+                sleep_efficiency = excluded.sleep_efficiency,
+                hrv_average = excluded.hrv_average,
+                activity_count = excluded.activity_count,
+                total_activity_minutes = excluded.total_activity_minutes,
+                total_distance_km = excluded.total_distance_km,
+                total_elevation_m = excluded.total_elevation_m,
+                symptom_count = excluded.symptom_count,
+                worst_symptom_severity = excluded.worst_symptom_severity,
+                has_headache = excluded.has_headache,
+                has_neuralgiaform = excluded.has_neuralgiaform,
+                incident_count = excluded.incident_count,
+                temp_avg_c = excluded.temp_avg_c,
+                pressure_hpa = excluded.pressure_hpa,
+                humidity_percent = excluded.humidity_percent,
+                morning_notes = excluded.morning_notes,
+                evening_notes = excluded.evening_notes,
+                general_notes = excluded.general_notes,
+                is_complete = excluded.is_complete,
+                updated_at = excluded.updated_at
         """, [
             entry_date,
             entry.overall_wellbeing, entry.energy_level, entry.stress_level, entry.mood,
             s.sleep_score if s else None, s.total_sleep_minutes if s else None,
             s.efficiency_percent if s else None, s.hrv_average if s else None,
             len(activities), total_activity_mins, total_distance, total_elevation,
-            len(entry.meals), total_alcohol,
             len(entry.symptoms), worst_severity, 1 if has_headache else 0, 1 if has_neuralgiaform else 0,
             len(entry.incidents),
             w.temp_avg_c if w else None, w.pressure_hpa if w else None,
@@ -698,7 +915,37 @@ class AnalyticsDB:
             1 if entry.is_complete else 0, datetime.now().isoformat()
         ])
     
+    @staticmethod
+    def _nutrition_cache_key(description: str, meal_type: str) -> str:
+        """Hash of the case/whitespace-normalized description and meal type."""
+        normalized = re.sub(r"\s+", " ", description.strip().lower())
+        return hashlib.blake2b(f"{meal_type}\0{normalized}".encode(), digest_size=16).hexdigest()
+    
     def find_cached_meal_nutrition(self, description: str, meal_type: str) -> Optional[dict]:
+        """Return a previous LLM nutrition result for the same description+meal_type."""
+        key = self._nutrition_cache_key(description, meal_type)
+        row = self.conn.execute(
+            "SELECT nutrition_json FROM nutrition_cache WHERE desc_hash = ?", [key]
+        ).fetchone()
+        if row is not None:
+            return {**json.loads(row[0]), "cached": True}
+        
+        # Meals estimated before the cache table existed
+        nutrition = self._find_logged_meal_nutrition(description, meal_type)
+        if nutrition is not None:
+            self._cache_meal_nutrition(description, meal_type, nutrition)
+            self.conn.commit()
+        return nutrition
+    
+    def _cache_meal_nutrition(self, description: str, meal_type: str, nutrition: dict) -> None:
+        """Remember an LLM nutrition estimate for repeat meals (caller commits)."""
+        payload = {k: v for k, v in nutrition.items() if k != "cached"}
+        self.conn.execute(
+            "INSERT OR REPLACE INTO nutrition_cache (desc_hash, nutrition_json) VALUES (?, ?)",
+            [self._nutrition_cache_key(description, meal_type), json.dumps(payload)],
+        )
+    
+    def _find_logged_meal_nutrition(self, description: str, meal_type: str) -> Optional[dict]:
         """Return the most recent LLM nutrition result for an identical description+meal_type."""
         row = self.conn.execute("""
             SELECT calories, protein_g, carbs_g, fat_g, fiber_g, sugar_g, sodium_mg,
@@ -761,6 +1008,10 @@ class AnalyticsDB:
             nutrition.get('reasoning'), notes
         ])
         
+        # Fresh LLM estimates are reused for identical meals later
+        if nutrition.get('source') == 'llm' and not nutrition.get('cached'):
+            self._cache_meal_nutrition(description, meal_type, nutrition)
+        
         self.conn.commit()
         
         # Sync meal totals to daily_summary
@@ -788,45 +1039,29 @@ class AnalyticsDB:
             WHERE entry_date = ?
         """, [entry_date_str]).fetchone()
         
-        # Get existing row data to preserve non-meal fields
-        existing = self.conn.execute(
-            "SELECT * FROM daily_summary WHERE entry_date = ? LIMIT 1", 
-            [entry_date_str]
-        ).fetchone()
-        
-        if existing:
-            # Update existing - only meal-related fields
-            self.conn.execute("""
-                UPDATE daily_summary SET
-                    meal_count = ?,
-                    total_calories = ?,
-                    total_protein_g = ?,
-                    total_carbs_g = ?,
-                    total_fat_g = ?,
-                    total_fiber_g = ?,
-                    total_caffeine_mg = ?,
-                    total_alcohol_units = ?,
-                    total_water_ml = ?,
-                    updated_at = ?
-                WHERE entry_date = ?
-            """, [
-                totals[0], totals[1], totals[2], totals[3], totals[4],
-                totals[5], totals[6], totals[7], totals[8],
-                datetime.now().isoformat(), entry_date_str
-            ])
-        else:
-            # Insert new row with just meal data
-            self.conn.execute("""
-                INSERT OR REPLACE INTO daily_summary (
-                    entry_date, meal_count, total_calories, total_protein_g,
-                    total_carbs_g, total_fat_g, total_fiber_g,
-                    total_caffeine_mg, total_alcohol_units, total_water_ml, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, [
-                entry_date_str, totals[0], totals[1], totals[2], totals[3],
-                totals[4], totals[5], totals[6], totals[7], totals[8],
-                datetime.now().isoformat()
-            ])
+        # Only meal-related fields are touched; the rest of the row is preserved
+        self.conn.execute("""
+            INSERT INTO daily_summary (
+                entry_date, meal_count, total_calories, total_protein_g,
+                total_carbs_g, total_fat_g, total_fiber_g,
+                total_caffeine_mg, total_alcohol_units, total_water_ml, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(entry_date) DO UPDATE SET
+                meal_count = excluded.meal_count,
+                total_calories = excluded.total_calories,
+                total_protein_g = excluded.total_protein_g,
+                total_carbs_g = excluded.total_carbs_g,
+                total_fat_g = excluded.total_fat_g,
+                total_fiber_g = excluded.total_fiber_g,
+                total_caffeine_mg = excluded.total_caffeine_mg,
+                total_alcohol_units = excluded.total_alcohol_units,
+                total_water_ml = excluded.total_water_ml,
+                updated_at = excluded.updated_at
+        """, [
+            entry_date_str, totals[0], totals[1], totals[2], totals[3],
+            totals[4], totals[5], totals[6], totals[7], totals[8],
+            datetime.now().isoformat()
+        ])
         
         self.conn.commit()
     
@@ -1173,24 +1408,14 @@ class AnalyticsDB:
         caffeine_mg = totals.get('total_caffeine_mg', 0)
         alcohol_units = totals.get('total_alcohol_units', 0)
         
-        existing = self.conn.execute(
-            "SELECT 1 FROM daily_summary WHERE entry_date = ?", 
-            [entry_date_str]
-        ).fetchone()
-        
-        if existing:
-            self.conn.execute("""
-                UPDATE daily_summary SET
-                    total_caffeine_mg = ?,
-                    total_alcohol_units = ?,
-                    updated_at = ?
-                WHERE entry_date = ?
-            """, [caffeine_mg, alcohol_units, datetime.now().isoformat(), entry_date_str])
-        else:
-            self.conn.execute("""
-                INSERT OR REPLACE INTO daily_summary (entry_date, total_caffeine_mg, total_alcohol_units, updated_at)
-                VALUES (?, ?, ?, ?)
-            """, [entry_date_str, caffeine_mg, alcohol_units, datetime.now().isoformat()])
+        self.conn.execute("""
+            INSERT INTO daily_summary (entry_date, total_caffeine_mg, total_alcohol_units, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(entry_date) DO UPDATE SET
+                total_caffeine_mg = excluded.total_caffeine_mg,
+                total_alcohol_units = excluded.total_alcohol_units,
+                updated_at = excluded.updated_at
+        """, [entry_date_str, caffeine_mg, alcohol_units, datetime.now().isoformat()])
         
         self.conn.commit()
     
@@ -1336,6 +1561,43 @@ class AnalyticsDB:
         """Execute arbitrary SQL query and return DataFrame."""
         return pd.read_sql(sql, self.conn, params=params or [])
     
+    def get_row_counts(self, table_names: list[str]) -> dict[str, Optional[int]]:
+        """Row counts for the given tables in one query (None if a table doesn't exist)."""
+        existing = {
+            row[0] for row in self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"
+            )
+        }
+        present = [name for name in table_names if name in existing]
+        
+        counts: dict[str, Optional[int]] = {name: None for name in table_names}
+        if present:
+            sql = " UNION ALL ".join(
+                f"SELECT '{name}', COUNT(*) FROM {name}" for name in present
+            )
+            counts.update(self.conn.execute(sql).fetchall())
+        return counts
+    
+    def get_table_sizes(self, table_names: list[str]) -> dict[str, Optional[int]]:
+        """
+        On-disk size in bytes of each table's B-tree (excluding indexes).
+        
+        Read from SQLite's dbstat page catalog in one query, without scanning
+        rows. Sizes are None if a table doesn't exist or SQLite was built
+        without dbstat.
+        """
+        sizes: dict[str, Optional[int]] = {name: None for name in table_names}
+        placeholders = ", ".join("?" for _ in table_names)
+        try:
+            rows = self.conn.execute(
+                f"SELECT name, pgsize FROM dbstat WHERE aggregate = 1 AND name IN ({placeholders})",
+                table_names,
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return sizes
+        sizes.update(rows)
+        return sizes
+    
     def get_table_info(self) -> pd.DataFrame:
         """Get information about all tables."""
         tables = pd.read_sql(
@@ -4,7 +4,7 @@ Parses natural language voice notes into structured diary data.
 """
 
 import json
-from datetime import time
+from datetime import datetime, time
 from typing import Optional
 
 from ..models.health import (
@@ -497,24 +497,27 @@ Return ONLY the JSON object, no other text."""
                     )
                     summary["meals_added"] += 1
         
+        # One timestamp for the whole batch of additions
+        now = datetime.now()
+        
         # Add medications
         for med in parsed_data.get("medications", []):
-            entry.add_medication(med)
+            entry.add_medication(med, now=now)
             summary["medications_added"] += 1
         
         # Add supplements
         for supp in parsed_data.get("supplements", []):
-            entry.add_supplement(supp)
+            entry.add_supplement(supp, now=now)
             summary["supplements_added"] += 1
         
         # Add symptoms
         for symp in parsed_data.get("symptoms", []):
-            entry.add_symptom(symp)
+            entry.add_symptom(symp, now=now)
             summary["symptoms_added"] += 1
         
         # Add incidents
         for inc in parsed_data.get("incidents", []):
-            entry.add_incident(inc)
+            entry.add_incident(inc, now=now)
             summary["incidents_added"] += 1
         
         # Update wellbeing if provided
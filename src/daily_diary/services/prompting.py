@@ -1,5 +1,6 @@
 """Interactive prompting service for diary entries."""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, time
 from typing import Optional
 
@@ -89,26 +90,30 @@ class DiaryPrompter:
         """Fetch data from integrated services."""
         self.console.print("\n[dim]Fetching data from integrations...[/dim]")
         
+        # The three services are independent, so query them concurrently
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            weather = activities = sleep = None
+            if self.weather.is_configured:
+                weather = pool.submit(self.weather.get_weather_for_date, entry.entry_date)
+            if self.strava.is_configured:
+                activities = pool.submit(self.strava.get_activities_for_date, entry.entry_date)
+            if self.oura.is_configured:
+                sleep = pool.submit(self.oura.get_sleep_for_date, entry.entry_date)
+        
         # Weather
-        if self.weather.is_configured:
-            weather = self.weather.get_weather_for_date(entry.entry_date)
-            if weather:
-                entry.integrations.weather = weather
-                self.console.print("  ✓ Weather data fetched")
+        if weather and weather.result():
+            entry.integrations.weather = weather.result()
+            self.console.print("  ✓ Weather data fetched")
         
         # Strava
-        if self.strava.is_configured:
-            activities = self.strava.get_activities_for_date(entry.entry_date)
-            if activities:
-                entry.integrations.activities = activities
-                self.console.print(f"  ✓ {len(activities)} activities fetched from Strava")
+        if activities and activities.result():
+            entry.integrations.activities = activities.result()
+            self.console.print(f"  ✓ {len(activities.result())} activities fetched from Strava")
         
         # Oura
-        if self.oura.is_configured:
-            sleep = self.oura.get_sleep_for_date(entry.entry_date)
-            if sleep:
-                entry.integrations.sleep = sleep
-                self.console.print("  ✓ Sleep data fetched from Oura")
+        if sleep and sleep.result():
+            entry.integrations.sleep = sleep.result()
+            self.console.print("  ✓ Sleep data fetched from Oura")
     
     def _show_integrations_summary(self, entry: DiaryEntry) -> None:
         """Display summary of auto-fetched data."""
@@ -1,14 +1,19 @@
 """Local storage service using TinyDB."""
 
+import heapq
 from datetime import date
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
+from pydantic import TypeAdapter
 from tinydb import Query, TinyDB
 
 from ..models.entry import DiaryEntry
 from ..utils.config import Settings, get_settings
 
+# Validates a whole list of stored entries in one call into pydantic-core
+_ENTRY_LIST = TypeAdapter(list[DiaryEntry])
+
 
 class DiaryStorage:
     """
@@ -52,13 +57,8 @@ class DiaryStorage:
         # Convert to dict for storage
         entry_dict = entry.model_dump(mode="json")
         
-        # Upsert based on entry_date
-        existing = self.db.search(Entry.entry_date == entry.entry_date.isoformat())
-        
-        if existing:
-            self.db.update(entry_dict, Entry.entry_date == entry.entry_date.isoformat())
-        else:
-            self.db.insert(entry_dict)
+        # Upsert based on entry_date (single pass over the table)
+        self.db.upsert(entry_dict, Entry.entry_date == entry.entry_date.isoformat())
         
         # Sync to analytics database
         if self.analytics:
@@ -83,13 +83,29 @@ class DiaryStorage:
     
     def get_recent_entries(self, days: int = 30) -> list[DiaryEntry]:
         """Get entries from the last N days."""
-        all_entries = self.db.all()
+        return list(self.iter_recent_entries(days))
+    
+    def iter_recent_entries(self, days: int = 30) -> Iterator[DiaryEntry]:
+        """
+        Yield the N most recent entries, newest first.
         
-        # Parse and sort by date
-        entries = [DiaryEntry.model_validate(e) for e in all_entries]
-        entries.sort(key=lambda e: e.entry_date, reverse=True)
+        Sorts the raw documents by their ISO date string and validates
+        each one only as it is consumed, so callers can render early.
         
-        return entries[:days]
+        Each document embeds its symptoms, incidents and integrations, so
+        the whole window comes from a single read - there are no per-entry
+        child lookups to batch.
+        """
+        for entry_dict in self.iter_recent_documents(days):
+            yield DiaryEntry.model_validate(entry_dict)
+    
+    def iter_recent_documents(self, days: int = 30) -> Iterator[dict]:
+        """
+        Yield the raw JSON documents of the N most recent entries, newest first.
+        
+        For read-only summaries that don't need validated models.
+        """
+        yield from heapq.nlargest(days, self.db.all(), key=lambda e: e["entry_date"])
     
     def get_entries_in_range(
         self,
@@ -104,13 +120,13 @@ class DiaryStorage:
             (Entry.entry_date <= end_date.isoformat())
         )
         
-        entries = [DiaryEntry.model_validate(e) for e in results]
+        entries = _ENTRY_LIST.validate_python(results)
         entries.sort(key=lambda e: e.entry_date)
         return entries
     
     def get_all_entries(self) -> list[DiaryEntry]:
         """Get all entries in the database."""
-        entries = [DiaryEntry.model_validate(e) for e in self.db.all()]
+        entries = _ENTRY_LIST.validate_python(self.db.all())
         entries.sort(key=lambda e: e.entry_date)
         return entries
     
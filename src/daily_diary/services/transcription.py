@@ -1,8 +1,10 @@
 """Voice transcription service using OpenAI Whisper or local faster-whisper."""
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Union
 
 from ..utils.config import Settings, get_settings
 
@@ -82,6 +84,89 @@ class TranscriptionService:
         Returns:
             Transcribed text, or None if transcription failed
         """
+        with self._prepared_audio(audio_path) as file_to_use:
+            # Try local transcription first (free!). A failure anywhere in the
+            # file falls back to the API rather than returning partial text
+            if self.has_local:
+                text = self._transcribe_local(file_to_use)
+                if text:
+                    return text
+            
+            return self._transcribe_fallback(file_to_use)
+    
+    def transcribe_files(
+        self,
+        audio_paths: list[Path],
+        concurrency: int = 8,
+    ) -> dict[Path, Union[str, None, Exception]]:
+        """
+        Transcribe several audio files.
+        
+        The local model is loaded once and runs files one after another (it
+        is CPU-bound and already uses every core). With only the OpenAI API
+        available, requests are sent concurrently.
+        
+        Args:
+            audio_paths: Audio files to transcribe
+            concurrency: Maximum simultaneous API requests
+            
+        Returns:
+            Mapping of each path to its text, None if nothing was
+            transcribed, or the exception raised for that file
+        """
+        def transcribe_one(path: Path) -> Union[str, None, Exception]:
+            try:
+                return self.transcribe_file(path)
+            except Exception as e:
+                return e
+        
+        if self.has_local or not audio_paths:
+            return {path: transcribe_one(path) for path in audio_paths}
+        
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(audio_paths))) as pool:
+            return dict(zip(audio_paths, pool.map(transcribe_one, audio_paths)))
+    
+    def transcribe_file_stream(self, audio_path: Path) -> Iterator[str]:
+        """
+        Transcribe an audio file, yielding text as it becomes available.
+        
+        The local model decodes lazily, so each segment is yielded as soon as
+        it is transcribed. The OpenAI fallback (whisper-1) has no streaming
+        mode and yields the full text once.
+        
+        Args:
+            audio_path: Path to the audio file
+            
+        Yields:
+            Transcribed text chunks, in order
+            
+        Raises:
+            RuntimeError: If local decoding fails after text was yielded; the
+                chunks so far are an incomplete transcript
+        """
+        with self._prepared_audio(audio_path) as file_to_use:
+            # Try local transcription first (free!)
+            if self.has_local:
+                got_text = False
+                try:
+                    for text in self._stream_local(file_to_use):
+                        got_text = True
+                        yield text
+                except Exception as e:
+                    # Text already handed out can't be swapped for the API result
+                    if got_text:
+                        raise RuntimeError(f"Local transcription failed partway: {e}") from e
+                    print(f"Local transcription error: {e}")
+                if got_text:
+                    return
+            
+            result = self._transcribe_fallback(file_to_use)
+            if result:
+                yield result
+    
+    @contextmanager
+    def _prepared_audio(self, audio_path: Path) -> Iterator[Path]:
+        """Validate audio_path and yield the file to transcribe, converting webm."""
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
@@ -98,34 +183,7 @@ class TranscriptionService:
                 file_to_use = converted_path
         
         try:
-            # Try local transcription first (free!)
-            if self.has_local:
-                result = self._transcribe_local(file_to_use)
-                if result:
-                    return result
-            
-            # If local-only mode, don't fall back to OpenAI
-            if self.local_only:
-                error_msg = "Local transcription failed."
-                if self._local_load_error:
-                    error_msg += f" {self._local_load_error}"
-                raise ValueError(error_msg)
-            
-            # Fall back to OpenAI API
-            if self.has_openai:
-                result = self._transcribe_openai(file_to_use)
-                if result:
-                    return result
-            
-            if not self.is_configured:
-                raise ValueError(
-                    "No transcription method available. Either:\n"
-                    "1. Install faster-whisper: uv pip install faster-whisper\n"
-                    "2. Set OPENAI_API_KEY in .env"
-                )
-            
-            return None
-            
+            yield file_to_use
         finally:
             # Clean up converted file
             if converted_path and converted_path.exists():
@@ -134,6 +192,29 @@ class TranscriptionService:
                 except Exception:
                     pass
     
+    def _transcribe_fallback(self, audio_path: Path) -> Optional[str]:
+        """Transcribe with the OpenAI API once local transcription produced nothing."""
+        # If local-only mode, don't fall back to OpenAI
+        if self.local_only:
+            error_msg = "Local transcription failed."
+            if self._local_load_error:
+                error_msg += f" {self._local_load_error}"
+            raise ValueError(error_msg)
+        
+        # Fall back to OpenAI API
+        if self.has_openai:
+            result = self._transcribe_openai(audio_path)
+            if result:
+                return result
+        
+        if not self.is_configured:
+            raise ValueError(
+                "No transcription method available. Either:\n"
+                "1. Install faster-whisper: uv pip install faster-whisper\n"
+                "2. Set OPENAI_API_KEY in .env"
+            )
+        return None
+    
     def _convert_audio(self, audio_path: Path) -> Optional[Path]:
         """Convert audio to wav format using ffmpeg."""
         try:
@@ -161,20 +242,26 @@ class TranscriptionService:
     def _transcribe_local(self, audio_path: Path) -> Optional[str]:
         """Transcribe using local faster-whisper model."""
         try:
-            segments, info = self.local_model.transcribe(
-                str(audio_path),
-                language="en",
-                initial_prompt="Health diary entry. Symptoms, pain levels, headaches, exercise, meals, incidents.",
-                vad_filter=True,  # Filter out silence
-            )
-            
-            # Combine all segments
-            text = " ".join(segment.text.strip() for segment in segments)
-            return text if text else None
-            
+            text = " ".join(self._stream_local(audio_path))
         except Exception as e:
             print(f"Local transcription error: {e}")
             return None
+        return text if text else None
+    
+    def _stream_local(self, audio_path: Path) -> Iterator[str]:
+        """Yield segment texts from the local model as they are decoded (errors propagate)."""
+        segments, info = self.local_model.transcribe(
+            str(audio_path),
+            language="en",
+            initial_prompt="Health diary entry. Symptoms, pain levels, headaches, exercise, meals, incidents.",
+            vad_filter=True,  # Filter out silence
+        )
+        
+        # segments is a lazy generator - decoding happens as we iterate
+        for segment in segments:
+            text = segment.text.strip()
+            if text:
+                yield text
     
     def _transcribe_openai(self, audio_path: Path) -> Optional[str]:
         """Transcribe using OpenAI Whisper API."""
@@ -1,6 +1,6 @@
 """Configuration management."""
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -15,6 +15,7 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
     
     # Weather API
@@ -47,12 +48,15 @@ class Settings(BaseSettings):
     # Data storage
     data_dir: Path = Field(default=Path("data"))
     
-    @property
+    # Settings are frozen after load, so the integration flags are
+    # computed once per instance
+    
+    @cached_property
     def has_weather(self) -> bool:
         # Open-Meteo is free and requires no API key, just lat/lon
         return self.default_latitude is not None and self.default_longitude is not None
     
-    @property
+    @cached_property
     def has_strava(self) -> bool:
         return all([
             self.strava_client_id,
@@ -60,7 +64,7 @@ class Settings(BaseSettings):
             self.strava_refresh_token,
         ])
     
-    @property
+    @cached_property
     def has_oura(self) -> bool:
         # Either PAT or OAuth2 credentials
         has_pat = self.oura_access_token is not None
@@ -71,12 +75,12 @@ class Settings(BaseSettings):
         ])
         return has_pat or has_oauth
     
-    @property
+    @cached_property
     def has_transcription(self) -> bool:
         return self.openai_api_key is not None
 
 
-@lru_cache
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get cached settings instance."""
+    """Get cached settings instance (.env is read once per process)."""
     return Settings()
@@ -0,0 +1,154 @@
+"""Persistent TTL cache for integration API responses."""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from pydantic import TypeAdapter
+
+from .config import get_settings
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class ResponseCache:
+    """
+    Two-level cache for API responses keyed by string.
+
+    - In-process LRU (bounded by maxsize) for repeat lookups in a long-running app
+    - SQLite file in the data directory so entries survive CLI restarts
+
+    Values are stored as JSON text with an absolute expiry timestamp.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, maxsize: int = 512):
+        self.db_path = db_path or (get_settings().data_dir / "api_cache.sqlite")
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.maxsize = maxsize
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("DELETE FROM responses WHERE expires_at < ?", [time.time()])
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection, commit on success and always close it."""
+        # Short-lived connections: clients may be called from worker threads
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _remember(self, key: str, expires_at: float, value: str) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached JSON for key, or None if missing/expired."""
+        now = time.time()
+
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None:
+                if hit[0] > now:
+                    self._memory.move_to_end(key)
+                    return hit[1]
+                del self._memory[key]
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ? AND expires_at > ?",
+                [key, now],
+            ).fetchone()
+        if row is None:
+            return None
+
+        self._remember(key, row[1], row[0])
+        return row[0]
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """Store JSON for key, expiring after ttl_seconds."""
+        expires_at = time.time() + ttl_seconds
+        self._remember(key, expires_at, value)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                [key, value, expires_at],
+            )
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._memory.clear()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    """Get the shared response cache instance."""
+    return ResponseCache()
+
+
+def cached_by_date(
+    integration: str,
+    return_type: Any,
+    ttl: Callable[[date], float],
+) -> Callable:
+    """
+    Cache a client method whose first argument is the target date.
+
+    The cache key is (integration, date, extra args). Empty results (None/[])
+    are never cached so transient failures are retried. Clients opt out per
+    instance by setting `use_cache = False` (e.g. for `fetch --force`).
+
+    Args:
+        integration: Name used in the cache key (e.g. "weather")
+        return_type: Type the method returns, used to (de)serialize JSON
+        ttl: Function of the target date giving the time-to-live in seconds
+    """
+    adapter = TypeAdapter(return_type)
+
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, target_date: date, *args, **kwargs):
+            if not getattr(self, "use_cache", True):
+                return method(self, target_date, *args, **kwargs)
+
+            key = f"{integration}:{target_date.isoformat()}"
+            if args or kwargs:
+                key += f":{args!r}:{sorted(kwargs.items())!r}"
+
+            cache = get_response_cache()
+            cached = cache.get(key)
+            if cached is not None:
+                return adapter.validate_json(cached)
+
+            result = method(self, target_date, *args, **kwargs)
+            if result:
+                cache.set(key, adapter.dump_json(result).decode(), ttl(target_date))
+            return result
+
+        return wrapper
+
+    return decorator
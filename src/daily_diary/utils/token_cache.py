@@ -0,0 +1,66 @@
+"""On-disk cache for OAuth access tokens."""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from .config import get_settings
+
+# Treat tokens this close to expiry as already expired
+EXPIRY_MARGIN = timedelta(minutes=5)
+
+
+class TokenCache:
+    """
+    Access tokens per service, persisted so short-lived CLI runs can skip
+    the refresh round-trip.
+
+    Stored as JSON in the data directory, readable only by the owner.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or (get_settings().data_dir / "tokens.json")
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, service: str) -> Optional[tuple[str, datetime]]:
+        """Return (token, expires_at) for service, or None if missing/expiring."""
+        entry = self._read().get(service)
+        if not entry:
+            return None
+        try:
+            token = entry["access_token"]
+            expires_at = datetime.fromisoformat(entry["expires_at"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if datetime.now(timezone.utc) >= expires_at - EXPIRY_MARGIN:
+            return None
+        return token, expires_at
+
+    def save(self, service: str, token: str, expires_at: datetime) -> None:
+        """Store the token for service until expires_at (timezone-aware)."""
+        with self._lock:
+            data = self._read()
+            data[service] = {"access_token": token, "expires_at": expires_at.isoformat()}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self.path)
+
+
+@lru_cache
+def get_token_cache() -> TokenCache:
+    """Get the shared token cache instance."""
+    return TokenCache()
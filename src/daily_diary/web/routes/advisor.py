@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import Optional
 
 from fastapi import APIRouter, Form, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 from ...services.advisor import HealthAdvisor
@@ -66,7 +66,7 @@ async def start_consultation(
         }, status_code=400)
     
     try:
-        greeting, provider = advisor.start_consultation(days, session_id)
+        greeting, provider = await advisor.start_consultation(days, session_id)
         
         return JSONResponse({
             "success": True,
@@ -95,7 +95,7 @@ async def send_message(
         }, status_code=400)
     
     try:
-        response, provider = advisor.send_message(message)
+        response, provider = await advisor.send_message(message)
         
         return JSONResponse({
             "success": True,
@@ -109,6 +109,26 @@ async def send_message(
         }, status_code=500)
 
 
+@router.post("/message/stream")
+async def stream_message(
+    session_id: str = Form(...),
+    message: str = Form(...),
+):
+    """Send a message to the health advisor and stream the reply as plain text."""
+    advisor = get_advisor(session_id)
+    
+    if not advisor.is_configured:
+        return JSONResponse({
+            "success": False,
+            "error": "No AI provider configured"
+        }, status_code=400)
+    
+    return StreamingResponse(
+        advisor.send_message_stream(message),
+        media_type="text/plain; charset=utf-8",
+    )
+
+
 @router.post("/end")
 async def end_consultation(
     session_id: str = Form(...),
@@ -120,7 +140,7 @@ async def end_consultation(
     advisor = _advisor_sessions[session_id]
     
     try:
-        result = advisor.end_consultation()
+        result = await advisor.end_consultation()
         del _advisor_sessions[session_id]
         
         return JSONResponse({
@@ -1,7 +1,9 @@
 """Routes for diary entries."""
 
+import asyncio
 import tempfile
 from datetime import date, datetime, time
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
@@ -35,6 +37,47 @@ def get_storage() -> DiaryStorage:
     return DiaryStorage()
 
 
+async def _fetch_integrations(
+    entry: DiaryEntry, kinds: set[str], use_cache: bool = True
+) -> None:
+    """
+    Fetch the given integrations ("weather", "activities", "sleep") for an entry.
+    
+    The clients are blocking, so each runs in a worker thread and the three
+    calls overlap instead of stalling the event loop one after another. A
+    failing integration leaves its existing value in place. Pass
+    use_cache=False to bypass the response cache (explicit refresh).
+    """
+    target_date = entry.entry_date
+    jobs = {}
+    
+    if "weather" in kinds:
+        weather_client = WeatherClient()
+        weather_client.use_cache = use_cache
+        if weather_client.is_configured:
+            jobs["weather"] = partial(weather_client.get_weather_for_date, target_date)
+    
+    if "activities" in kinds:
+        strava_client = StravaClient()
+        strava_client.use_cache = use_cache
+        if strava_client.is_configured:
+            jobs["activities"] = partial(strava_client.get_activities_for_date, target_date)
+    
+    if "sleep" in kinds:
+        oura_client = OuraClient()
+        oura_client.use_cache = use_cache
+        if oura_client.is_configured:
+            jobs["sleep"] = partial(oura_client.get_sleep_for_date, target_date)
+    
+    results = await asyncio.gather(
+        *(asyncio.to_thread(job) for job in jobs.values()),
+        return_exceptions=True,
+    )
+    for name, result in zip(jobs, results):
+        if not isinstance(result, Exception):
+            setattr(entry.integrations, name, result)
+
+
 def _sync_quick_log_meds(entry, routines_service):
     """Sync medicine/supplement quick_log items to medications/supplements lists."""
     from ...models.health import Medication, Supplement
@@ -198,20 +241,10 @@ async def new_entry_form(
         previous_entry = storage.get_entry(previous_date)
     
     # Fetch integrations if not already present
-    if not entry.integrations.weather:
-        weather_client = WeatherClient()
-        if weather_client.is_configured:
-            entry.integrations.weather = weather_client.get_weather_for_date(target_date)
-    
-    if not entry.integrations.activities:
-        strava_client = StravaClient()
-        if strava_client.is_configured:
-            entry.integrations.activities = strava_client.get_activities_for_date(target_date)
-    
-    if not entry.integrations.sleep:
-        oura_client = OuraClient()
-        if oura_client.is_configured:
-            entry.integrations.sleep = oura_client.get_sleep_for_date(target_date)
+    await _fetch_integrations(entry, {
+        name for name in ("weather", "activities", "sleep")
+        if not getattr(entry.integrations, name)
+    })
     
     # Get routines and calculate totals
     routines_service = RoutinesService()
@@ -1054,23 +1087,12 @@ async def refresh_integrations(request: Request):
         with get_storage() as storage:
             entry = storage.get_or_create_entry(target_date)
             
-            # Refresh weather
-            if refresh_type in (None, 'weather'):
-                weather_client = WeatherClient()
-                if weather_client.is_configured:
-                    entry.integrations.weather = weather_client.get_weather_for_date(target_date)
-            
-            # Refresh activities
-            if refresh_type in (None, 'activities'):
-                strava_client = StravaClient()
-                if strava_client.is_configured:
-                    entry.integrations.activities = strava_client.get_activities_for_date(target_date)
-            
-            # Refresh sleep
-            if refresh_type in (None, 'sleep'):
-                oura_client = OuraClient()
-                if oura_client.is_configured:
-                    entry.integrations.sleep = oura_client.get_sleep_for_date(target_date)
+            # Refresh the requested integration, or all of them concurrently
+            await _fetch_integrations(
+                entry,
+                {refresh_type} if refresh_type else {"weather", "activities", "sleep"},
+                use_cache=False,
+            )
             
             entry.updated_at = datetime.now()
             storage.save_entry(entry)
@@ -0,0 +1,142 @@
+"""Tests for the health advisor conversation handling."""
+
+import asyncio
+
+import pytest
+
+from daily_diary.services.advisor import HealthAdvisor
+
+
+def turns(*contents: str) -> list[dict]:
+    """Alternating user/assistant messages, starting with the user."""
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": content}
+        for i, content in enumerate(contents)
+    ]
+
+
+@pytest.fixture
+def advisor():
+    return HealthAdvisor()
+
+
+class TestPromptHistory:
+    """Tests for the bounded history sent to the providers."""
+
+    def test_short_history_unchanged(self, advisor):
+        """Test a conversation within the bounds is sent as is."""
+        advisor._conversation_history = turns("[Started consultation]", "Hello")
+
+        assert advisor._prompt_history() == advisor._conversation_history
+
+    def test_older_turns_folded_into_recap(self, advisor):
+        """Test only the last messages are kept and earlier ones are recapped."""
+        history = turns(*(f"message {i}" for i in range(20)))
+        advisor._conversation_history = history
+
+        window = advisor._prompt_history()
+
+        assert len(window) == advisor.MAX_HISTORY_MESSAGES
+        assert window[0]["role"] == "user"
+        assert window[0]["content"].startswith("[Earlier in this consultation: Patient: message 0")
+        assert window[0]["content"].endswith("\n\nmessage 8")
+        assert window[1:] == history[9:]
+        assert len(advisor._conversation_history) == 20
+
+    def test_size_bound_drops_older_pairs(self, advisor):
+        """Test the kept window shrinks while it exceeds the character budget."""
+        advisor.MAX_HISTORY_CHARS = 250
+        advisor._conversation_history = turns(*("x" * 100 for _ in range(6)))
+
+        window = advisor._prompt_history()
+
+        assert len(window) == 2
+        assert window[0]["content"].startswith("[Earlier in this consultation:")
+
+    def test_window_without_user_turn_is_bounded(self, advisor):
+        """Test a tail of assistant-only turns isn't replaced by the full history."""
+        advisor._conversation_history = turns("question") + [
+            {"role": "assistant", "content": f"part {i}"} for i in range(15)
+        ]
+
+        window = advisor._prompt_history()
+
+        assert len(window) == 1
+        assert window[0]["role"] == "user"
+        assert "Patient: question" in window[0]["content"]
+
+
+async def collect(stream, limit=None) -> list[str]:
+    """Consume an async text stream, optionally stopping early like a disconnect."""
+    chunks = []
+    async for text in stream:
+        chunks.append(text)
+        if limit is not None and len(chunks) == limit:
+            break
+    await stream.aclose()
+    return chunks
+
+
+def fake_stream(*chunks: str, fail: bool = False):
+    async def stream(system_prompt, user_message):
+        for text in chunks:
+            yield text
+        if fail:
+            raise RuntimeError("connection reset")
+    return stream
+
+
+@pytest.fixture
+def streaming_advisor(advisor, monkeypatch):
+    monkeypatch.setattr(HealthAdvisor, "has_claude", property(lambda self: True))
+    monkeypatch.setattr(HealthAdvisor, "has_openai", property(lambda self: True))
+    advisor._stream_openai = fake_stream("fallback")
+    return advisor
+
+
+class TestSendMessageStream:
+    """Tests for streamed replies and how they are recorded."""
+
+    def test_complete_reply_recorded(self, streaming_advisor):
+        """Test a finished stream is saved as the assistant turn."""
+        streaming_advisor._stream_claude = fake_stream("Hel", "lo")
+
+        chunks = asyncio.run(collect(streaming_advisor.send_message_stream("hi")))
+
+        assert chunks == ["Hel", "lo"]
+        assert streaming_advisor._conversation_history[-1] == {
+            "role": "assistant", "content": "Hello",
+        }
+
+    def test_failure_before_text_falls_back(self, streaming_advisor):
+        """Test OpenAI is used when Claude fails before producing text."""
+        streaming_advisor._stream_claude = fake_stream(fail=True)
+
+        chunks = asyncio.run(collect(streaming_advisor.send_message_stream("hi")))
+
+        assert chunks == ["fallback"]
+        assert streaming_advisor._conversation_history[-1]["content"] == "fallback"
+
+    def test_failure_mid_reply_marked_truncated(self, streaming_advisor):
+        """Test a reply cut off by a provider error is saved as truncated."""
+        streaming_advisor._stream_claude = fake_stream("Partial", fail=True)
+
+        chunks = asyncio.run(collect(streaming_advisor.send_message_stream("hi")))
+
+        assert chunks == ["Partial"]
+        assert streaming_advisor._conversation_history[-1]["content"] == (
+            f"Partial {HealthAdvisor.TRUNCATED_MARKER}"
+        )
+
+    def test_disconnect_still_records_assistant_turn(self, streaming_advisor):
+        """Test abandoning the stream leaves a truncated assistant turn, not a dangling user turn."""
+        streaming_advisor._stream_claude = fake_stream("One", "Two", "Three")
+
+        asyncio.run(collect(streaming_advisor.send_message_stream("hi"), limit=1))
+
+        assert [m["role"] for m in streaming_advisor._conversation_history] == [
+            "user", "assistant",
+        ]
+        assert streaming_advisor._conversation_history[-1]["content"] == (
+            f"One {HealthAdvisor.TRUNCATED_MARKER}"
+        )
@@ -0,0 +1,120 @@
+"""Tests for the SQLite analytics database."""
+
+from datetime import date
+
+import pytest
+
+from daily_diary.models import DiaryEntry
+from daily_diary.models.integrations import ActivityData
+from daily_diary.services.database import AnalyticsDB
+
+
+@pytest.fixture
+def db(tmp_path):
+    analytics = AnalyticsDB(tmp_path / "analytics.db")
+    yield analytics
+    analytics.close()
+
+
+def summary(db: AnalyticsDB, entry_date: date):
+    return db.conn.execute(
+        "SELECT meal_count, total_calories, total_alcohol_units FROM daily_summary "
+        "WHERE entry_date = ?",
+        [entry_date.isoformat()],
+    ).fetchone()
+
+
+def add_meal_row(db: AnalyticsDB, meal_id: str, entry_date: date, calories: float) -> None:
+    """Insert a meal row directly so only the triggers maintain the totals."""
+    db.conn.execute(
+        "INSERT INTO meals (id, entry_date, meal_type, description, calories) "
+        "VALUES (?, ?, 'lunch', 'soup', ?)",
+        [meal_id, entry_date.isoformat(), calories],
+    )
+
+
+class TestDailySummaryMealTotals:
+    """Tests for meal totals in daily_summary."""
+
+    def test_resync_keeps_meal_count(self, db):
+        """Test syncing an entry doesn't overwrite totals built from meal rows."""
+        day = date(2025, 3, 1)
+        db.add_meal_with_nutrition(day, "lunch", "soup", {"calories": 300, "alcohol_units": 1.0})
+
+        db.upsert_entry(DiaryEntry(entry_date=day))
+
+        row = summary(db, day)
+        assert row["meal_count"] == 1
+        assert row["total_calories"] == 300
+        assert row["total_alcohol_units"] == 1.0
+
+    def test_triggers_track_meal_rows(self, db):
+        """Test insert, delete and date-moving update keep totals in step."""
+        day, other = date(2025, 3, 1), date(2025, 3, 2)
+        add_meal_row(db, "m1", day, 300)
+        add_meal_row(db, "m2", day, 200)
+        assert tuple(summary(db, day))[:2] == (2, 500)
+
+        db.conn.execute("UPDATE meals SET entry_date = ? WHERE id = 'm2'", [other.isoformat()])
+        assert tuple(summary(db, day))[:2] == (1, 300)
+        assert tuple(summary(db, other))[:2] == (1, 200)
+
+        db.conn.execute("DELETE FROM meals WHERE id = 'm1'")
+        assert tuple(summary(db, day))[:2] == (0, 0)
+
+    def test_trigger_totals_survive_entry_sync(self, db):
+        """Test trigger-maintained totals aren't reset by upsert_entry."""
+        day = date(2025, 3, 1)
+        add_meal_row(db, "m1", day, 450)
+
+        db.upsert_entry(DiaryEntry(entry_date=day))
+        add_meal_row(db, "m2", day, 50)
+
+        assert tuple(summary(db, day))[:2] == (2, 500)
+
+    def test_first_trigger_install_rebuilds_totals(self, tmp_path):
+        """Test meal totals are rebuilt once, leaving quick-log caffeine and alcohol alone."""
+        path = tmp_path / "analytics.db"
+        with AnalyticsDB(path) as db:
+            db.conn.executescript("""
+                DROP TRIGGER meals_ai;
+                DROP TRIGGER meals_ad;
+                DROP TRIGGER meals_au;
+            """)
+            add_meal_row(db, "m1", date(2025, 3, 1), 300)
+            db.conn.execute(
+                "INSERT INTO daily_summary (entry_date, meal_count, total_calories) "
+                "VALUES ('2025-03-02', NULL, 999)"
+            )
+            for day in (date(2025, 3, 1), date(2025, 3, 2)):
+                db.sync_quick_log(
+                    day, {}, {"total_caffeine_mg": 95, "total_alcohol_units": 2.0}
+                )
+
+        with AnalyticsDB(path) as db:
+            assert tuple(summary(db, date(2025, 3, 1))) == (1, 300, 2.0)
+            assert tuple(summary(db, date(2025, 3, 2))) == (0, 0, 2.0)
+            caffeine = db.conn.execute(
+                "SELECT total_caffeine_mg FROM daily_summary ORDER BY entry_date"
+            ).fetchall()
+            assert [row[0] for row in caffeine] == [95, 95]
+
+
+class TestActivitySync:
+    """Tests for syncing integration activities."""
+
+    def test_resync_keeps_stored_description(self, db):
+        """Test a re-synced activity without a description keeps the stored one."""
+        day = date(2025, 3, 1)
+        entry = DiaryEntry(entry_date=day)
+        entry.integrations.activities = [
+            ActivityData(activity_id="42", activity_type="Ride", duration_minutes=60,
+                         description="Hill repeats"),
+        ]
+        db.upsert_entry(entry)
+
+        entry.integrations.activities[0].description = None
+        db.upsert_entry(entry)
+
+        row = db.conn.execute("SELECT description FROM activities WHERE id = '42'").fetchone()
+        assert row["description"] == "Hill repeats"
@@ -0,0 +1,128 @@
+"""Tests for the shared HTTP retry helpers."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from daily_diary.clients import http
+from daily_diary.clients.http import MAX_ATTEMPTS, MAX_RETRY_WAIT, aget_with_retry, get_with_retry
+
+URL = "https://api.example.com/data"
+
+
+def replay(*responses: httpx.Response):
+    """MockTransport handler answering with the given responses in order."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return responses[min(len(calls), len(responses)) - 1]
+
+    return handler, calls
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record requested waits instead of sleeping."""
+    waits = []
+
+    async def fake_async_sleep(delay):
+        waits.append(delay)
+
+    monkeypatch.setattr(http.time, "sleep", waits.append)
+    monkeypatch.setattr(http.asyncio, "sleep", fake_async_sleep)
+    return waits
+
+
+class TestGetWithRetry:
+    """Tests for get_with_retry."""
+
+    def test_honours_retry_after(self, sleeps):
+        """Test a 429 is retried after the Retry-After seconds."""
+        handler, calls = replay(
+            httpx.Response(429, headers={"Retry-After": "7"}),
+            httpx.Response(200, json={"ok": True}),
+        )
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            response = get_with_retry(client, URL)
+
+        assert response.status_code == 200
+        assert len(calls) == 2
+        assert sleeps == [7.0]
+
+    def test_backs_off_without_retry_after(self, sleeps):
+        """Test 5xx responses without Retry-After use jittered exponential backoff."""
+        handler, calls = replay(httpx.Response(503), httpx.Response(503), httpx.Response(200))
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            assert get_with_retry(client, URL).status_code == 200
+
+        assert 1 <= sleeps[0] < 2
+        assert 2 <= sleeps[1] < 3
+
+    def test_long_retry_after_not_waited_for(self, sleeps):
+        """Test a Retry-After over MAX_RETRY_WAIT hands the response straight back."""
+        wait = str(int(MAX_RETRY_WAIT) + 1)
+        handler, calls = replay(httpx.Response(429, headers={"Retry-After": wait}))
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            assert get_with_retry(client, URL).status_code == 429
+
+        assert len(calls) == 1
+        assert sleeps == []
+
+    def test_gives_up_after_max_attempts(self, sleeps):
+        """Test persistent rate limiting returns the last response after MAX_ATTEMPTS."""
+        handler, calls = replay(httpx.Response(429, headers={"Retry-After": "1"}))
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            assert get_with_retry(client, URL).status_code == 429
+
+        assert len(calls) == MAX_ATTEMPTS
+        assert sleeps == [1.0] * (MAX_ATTEMPTS - 1)
+
+    def test_other_errors_not_retried(self, sleeps):
+        """Test non-retryable statuses are returned immediately."""
+        handler, calls = replay(httpx.Response(404))
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            assert get_with_retry(client, URL).status_code == 404
+
+        assert len(calls) == 1
+
+
+class TestAgetWithRetry:
+    """Tests for aget_with_retry."""
+
+    @staticmethod
+    def fetch(handler) -> httpx.Response:
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await aget_with_retry(client, URL)
+
+        return asyncio.run(run())
+
+    def test_honours_retry_after(self, sleeps):
+        """Test a 429 is retried after the Retry-After seconds."""
+        handler, calls = replay(
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(200),
+        )
+
+        assert self.fetch(handler).status_code == 200
+        assert len(calls) == 2
+        assert sleeps == [3.0]
+
+    def test_long_retry_after_not_waited_for(self, sleeps):
+        """Test a Retry-After over MAX_RETRY_WAIT hands the response straight back."""
+        wait = str(int(MAX_RETRY_WAIT) * 15)
+        handler, calls = replay(httpx.Response(429, headers={"Retry-After": wait}))
+
+        assert self.fetch(handler).status_code == 429
+        assert len(calls) == 1
+        assert sleeps == []
+
+    def test_gives_up_after_max_attempts(self, sleeps):
+        """Test persistent failures return the last response after MAX_ATTEMPTS."""
+        handler, calls = replay(httpx.Response(502, headers={"Retry-After": "2"}))
+
+        assert self.fetch(handler).status_code == 502
+        assert len(calls) == MAX_ATTEMPTS
+        assert sleeps == [2.0] * (MAX_ATTEMPTS - 1)
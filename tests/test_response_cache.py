@@ -0,0 +1,69 @@
+"""Tests for the integration response cache."""
+
+from datetime import date
+from typing import Optional
+
+from daily_diary.models import WeatherData
+from daily_diary.utils import response_cache
+from daily_diary.utils.response_cache import ResponseCache, cached_by_date
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_set_and_get(self, tmp_path):
+        """Test values round-trip and persist across instances."""
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        cache.set("k", '{"a": 1}', ttl_seconds=60)
+
+        assert cache.get("k") == '{"a": 1}'
+        assert ResponseCache(tmp_path / "cache.sqlite").get("k") == '{"a": 1}'
+
+    def test_expired(self, tmp_path):
+        """Test expired entries are not returned."""
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        cache.set("k", "1", ttl_seconds=-1)
+
+        assert cache.get("k") is None
+
+    def test_lru_eviction(self, tmp_path):
+        """Test in-memory layer is bounded but disk still serves evicted keys."""
+        cache = ResponseCache(tmp_path / "cache.sqlite", maxsize=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, key, ttl_seconds=60)
+
+        assert list(cache._memory) == ["b", "c"]
+        assert cache.get("a") == "a"
+
+
+class TestCachedByDate:
+    """Tests for the cached_by_date decorator."""
+
+    def test_caches_non_empty_results(self, tmp_path, monkeypatch):
+        """Test repeat calls hit the cache and empty results are not stored."""
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        monkeypatch.setattr(response_cache, "get_response_cache", lambda: cache)
+
+        class FakeClient:
+            use_cache = True
+            calls = 0
+
+            @cached_by_date("weather", Optional[WeatherData], ttl=lambda _: 60)
+            def get(self, target_date: date) -> Optional[WeatherData]:
+                self.calls += 1
+                if target_date.day == 1:
+                    return None
+                return WeatherData(temp_avg_c=12.5)
+
+        client = FakeClient()
+        assert client.get(date(2025, 1, 2)).temp_avg_c == 12.5
+        assert client.get(date(2025, 1, 2)).temp_avg_c == 12.5
+        assert client.calls == 1
+
+        client.get(date(2025, 1, 1))
+        client.get(date(2025, 1, 1))
+        assert client.calls == 3
+
+        client.use_cache = False
+        client.get(date(2025, 1, 2))
+        assert client.calls == 4
@@ -0,0 +1,60 @@
+"""Tests for the on-disk OAuth token cache."""
+
+import stat
+from datetime import datetime, timedelta, timezone
+
+from daily_diary.utils.token_cache import EXPIRY_MARGIN, TokenCache
+
+
+def in_future(delta: timedelta) -> datetime:
+    return datetime.now(timezone.utc) + delta
+
+
+class TestTokenCache:
+    """Tests for TokenCache."""
+
+    def test_save_and_load(self, tmp_path):
+        """Test tokens round-trip per service and persist across instances."""
+        expires_at = in_future(timedelta(hours=1))
+        TokenCache(tmp_path / "tokens.json").save("strava", "abc", expires_at)
+
+        cache = TokenCache(tmp_path / "tokens.json")
+        assert cache.load("strava") == ("abc", expires_at)
+        assert cache.load("oura") is None
+
+    def test_expiring_token_not_returned(self, tmp_path):
+        """Test tokens inside the expiry margin count as expired."""
+        cache = TokenCache(tmp_path / "tokens.json")
+        cache.save("strava", "soon", in_future(EXPIRY_MARGIN - timedelta(seconds=30)))
+        cache.save("oura", "later", in_future(EXPIRY_MARGIN + timedelta(minutes=1)))
+
+        assert cache.load("strava") is None
+        assert cache.load("oura")[0] == "later"
+
+    def test_file_is_owner_only_and_replaced_atomically(self, tmp_path):
+        """Test the token file is written 0600 with no temp file left behind."""
+        path = tmp_path / "data" / "tokens.json"
+        cache = TokenCache(path)
+        cache.save("strava", "abc", in_future(timedelta(hours=1)))
+        cache.save("oura", "def", in_future(timedelta(hours=1)))
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert list(path.parent.iterdir()) == [path]
+        assert cache.load("strava")[0] == "abc"
+
+    def test_missing_file(self, tmp_path):
+        """Test a missing file behaves as an empty cache."""
+        assert TokenCache(tmp_path / "tokens.json").load("strava") is None
+
+    def test_corrupt_file(self, tmp_path):
+        """Test unreadable or malformed entries are ignored and overwritten on save."""
+        path = tmp_path / "tokens.json"
+        path.write_text("{not json")
+        cache = TokenCache(path)
+        assert cache.load("strava") is None
+
+        path.write_text('{"strava": {"access_token": "abc", "expires_at": "soon"}}')
+        assert cache.load("strava") is None
+
+        cache.save("strava", "abc", in_future(timedelta(hours=1)))
+        assert cache.load("strava")[0] == "abc"
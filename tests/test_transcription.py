@@ -0,0 +1,85 @@
+"""Tests for the transcription service."""
+
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+
+from daily_diary.services.transcription import TranscriptionService
+from daily_diary.utils.config import Settings
+
+
+class FakeModel:
+    """faster-whisper stand-in whose lazy segments fail after `fail_after` of them."""
+
+    def __init__(self, texts: list[str], fail_after: Optional[int] = None):
+        self.texts = texts
+        self.fail_after = fail_after
+
+    def transcribe(self, path, **kwargs):
+        def segments():
+            for i, text in enumerate(self.texts):
+                if i == self.fail_after:
+                    raise RuntimeError("decoder error")
+                yield SimpleNamespace(text=f" {text} ")
+        return segments(), SimpleNamespace(language="en", duration=1.0)
+
+
+@pytest.fixture
+def audio(tmp_path):
+    path = tmp_path / "note.wav"
+    path.write_bytes(b"RIFF")
+    return path
+
+
+def make_service(model: FakeModel, monkeypatch, openai_text: str = "full text from api"):
+    service = TranscriptionService(Settings(_env_file=None, openai_api_key="sk-test"))
+    service._local_model = model
+    service._local_model_checked = True
+    monkeypatch.setattr(service, "_transcribe_openai", lambda path: openai_text)
+    return service
+
+
+class TestTranscribeFile:
+    """Tests for transcribe_file."""
+
+    def test_local_transcript(self, audio, monkeypatch):
+        """Test segments from the local model are joined."""
+        service = make_service(FakeModel(["hello", "world"]), monkeypatch)
+
+        assert service.transcribe_file(audio) == "hello world"
+
+    def test_local_failure_partway_falls_back(self, audio, monkeypatch):
+        """Test a decoder error mid-file uses the API instead of returning partial text."""
+        service = make_service(FakeModel(["hello", "world"], fail_after=1), monkeypatch)
+
+        assert service.transcribe_file(audio) == "full text from api"
+
+    def test_local_only_failure_raises(self, audio, monkeypatch):
+        """Test local-only mode reports the failure rather than returning partial text."""
+        service = make_service(FakeModel(["hello", "world"], fail_after=1), monkeypatch)
+        service.local_only = True
+
+        with pytest.raises(ValueError, match="Local transcription failed"):
+            service.transcribe_file(audio)
+
+
+class TestTranscribeFileStream:
+    """Tests for transcribe_file_stream."""
+
+    def test_failure_before_text_falls_back(self, audio, monkeypatch):
+        """Test a decoder error before any text streams the API result."""
+        service = make_service(FakeModel(["hello"], fail_after=0), monkeypatch)
+
+        assert list(service.transcribe_file_stream(audio)) == ["full text from api"]
+
+    def test_failure_after_text_raises(self, audio, monkeypatch):
+        """Test a decoder error after text was yielded isn't reported as a complete transcript."""
+        service = make_service(FakeModel(["hello", "world"], fail_after=1), monkeypatch)
+        chunks = []
+
+        with pytest.raises(RuntimeError, match="failed partway"):
+            for chunk in service.transcribe_file_stream(audio):
+                chunks.append(chunk)
+
+        assert chunks == ["hello"]
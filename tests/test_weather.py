@@ -0,0 +1,114 @@
+"""Tests for the Open-Meteo weather client."""
+
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from daily_diary.clients.weather import WeatherClient
+from daily_diary.utils import response_cache
+from daily_diary.utils.config import Settings
+from daily_diary.utils.response_cache import ResponseCache
+
+
+def open_meteo_payload(start: date, days: int, noon_pressures: list[float]) -> dict:
+    """Canned Open-Meteo response for `days` days from start (day before included)."""
+    dates = [(start - timedelta(days=1) + timedelta(days=i)).isoformat() for i in range(days + 1)]
+    pressures = []
+    for noon in noon_pressures:
+        pressures += [noon - 1] * 12 + [noon] + [noon + 1] * 11
+    return {
+        "daily": {
+            "time": dates,
+            "temperature_2m_max": [20.0] * len(dates),
+            "temperature_2m_min": [10.0] * len(dates),
+            "temperature_2m_mean": [15.0] * len(dates),
+            "precipitation_sum": [0.0] * len(dates),
+            "precipitation_hours": [0.0] * len(dates),
+            "wind_speed_10m_max": [12.0] * len(dates),
+        },
+        "hourly": {
+            "surface_pressure": pressures,
+            "relative_humidity_2m": [60] * (24 * len(dates)),
+        },
+    }
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    monkeypatch.setattr(response_cache, "get_response_cache", lambda: cache)
+    return cache
+
+
+def make_client(requests: list, latitude: float = 45.5, longitude: float = -122.7):
+    """WeatherClient whose HTTP calls are answered from a canned payload."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        start = date.fromisoformat(request.url.params["start_date"]) + timedelta(days=1)
+        return httpx.Response(200, json=open_meteo_payload(start, 1, [1010.0, 1012.0]))
+
+    settings = Settings(_env_file=None, default_latitude=latitude, default_longitude=longitude)
+    return WeatherClient(settings, httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+class TestWeatherCache:
+    """Tests for caching of weather lookups."""
+
+    def test_default_location_is_part_of_cache_key(self, cache):
+        """Test changing the default location doesn't serve the old location's weather."""
+        requests = []
+        day = date(2024, 6, 1)
+
+        make_client(requests).get_weather_for_date(day)
+        make_client(requests).get_weather_for_date(day)
+        assert len(requests) == 1
+
+        moved = make_client(requests, latitude=51.5, longitude=-0.1).get_weather_for_date(day)
+        assert len(requests) == 2
+        assert requests[-1].url.params["latitude"] == "51.5"
+        assert moved.location == "51.50, -0.10"
+
+
+class TestParseRange:
+    """Tests for parsing a canned Open-Meteo range response."""
+
+    def test_days_in_range_with_pressure_change(self):
+        """Test only [start, end] is returned and the first day uses the day before."""
+        start, end = date(2024, 6, 1), date(2024, 6, 3)
+        data = open_meteo_payload(start, 3, [1010.0, 1013.5, 1011.0, 1011.0])
+
+        days = WeatherClient(Settings(_env_file=None))._parse_range(data, start, end, 45.5, -122.7)
+
+        assert list(days) == [start, date(2024, 6, 2), end]
+        assert [d.pressure_hpa for d in days.values()] == [1013.5, 1011.0, 1011.0]
+        assert [d.pressure_change_hpa for d in days.values()] == [3.5, -2.5, 0.0]
+        assert days[start].location == "45.50, -122.70"
+
+    def test_humidity_ignores_missing_samples(self):
+        """Test None humidity hours are skipped and an all-None day has no humidity."""
+        start = date(2024, 6, 1)
+        data = open_meteo_payload(start, 2, [1010.0, 1010.0, 1010.0])
+        humidity = data["hourly"]["relative_humidity_2m"]
+        humidity[24:48] = [None] * 12 + [80] * 12
+        humidity[48:72] = [None] * 24
+
+        days = WeatherClient(Settings(_env_file=None))._parse_range(
+            data, start, date(2024, 6, 2), 45.5, -122.7
+        )
+
+        assert days[start].humidity_percent == 80
+        assert days[date(2024, 6, 2)].humidity_percent is None
+
+    def test_malformed_day_skipped(self):
+        """Test a day with truncated daily arrays is dropped, not fatal."""
+        start = date(2024, 6, 1)
+        data = open_meteo_payload(start, 2, [1010.0, 1010.0, 1010.0])
+        data["daily"]["precipitation_sum"] = [0.0, 0.0]
+
+        days = WeatherClient(Settings(_env_file=None))._parse_range(
+            data, start, date(2024, 6, 2), 45.5, -122.7
+        )
+
+        assert list(days) == [start]